@@ -3,7 +3,7 @@ from typing import Dict, Any, Optional
 from semantic_kernel.agents import ChatCompletionAgent
 
 from services.kernel_service import KernelService
-from prompts.prompt_loader import PromptLoader
+from prompts.prompt_loader import get_prompt_loader
 
 class BaseAgent(ABC):
     """エージェントの基底クラス"""
@@ -12,7 +12,7 @@ class BaseAgent(ABC):
         self.agent_type = agent_type
         self.kernel_service = kernel_service
         self.prompt_version = prompt_version
-        self.prompt_loader = PromptLoader()
+        self.prompt_loader = get_prompt_loader()  # 共有インスタンス（読み込みキャッシュを再利用）
         self.agent = None
         self.current_model = None
         
@@ -13,6 +13,7 @@ from services.text_processor import TextProcessor
 from services.kernel_service import KernelService, AgentOrchestrator
 from services.chat_manager import ChatManager, StreamingCallback
 from services.session_manager import SessionManager
+from prompts.prompt_loader import get_prompt_loader
 # from utils.profiler import profiler
 
 # エージェントのインポート
@@ -98,11 +99,6 @@ class QAApp:
             st.warning("エージェントをフォールバックモードで初期化中...")
 
             # 従来の直接初期化を試行
-            from agents.student_agent import StudentAgent
-            from agents.teacher_agent import TeacherAgent
-            from agents.initial_summarizer_agent import InitialSummarizerAgent
-            from agents.summarizer_agent import SummarizerAgent
-
             self.student_agent = StudentAgent(self.kernel_service, question_level)
             self.teacher_agent = TeacherAgent(self.kernel_service)
             self.initial_summarizer_agent = InitialSummarizerAgent(self.kernel_service)
@@ -137,6 +133,9 @@ class QAApp:
         if not check_password():
             return
         
+        # スタイルを適用（メインエリアの先頭に固定し、他の要素より先に反映）
+        StyleManager.apply_custom_styles()
+        
         # サイドバーで設定を描画（ログアウトボタン含む）
         sidebar_settings = self.components.render_sidebar_settings()
         self._cached_sidebar_settings = sidebar_settings
@@ -146,9 +145,6 @@ class QAApp:
             st.error(self.initialization_error)
             st.stop()
         
-        # スタイルを適用
-        StyleManager.apply_custom_styles()
-        
         # セッション管理の初期化
         SessionManager.initialize_session()
         
@@ -205,8 +201,7 @@ class QAApp:
     def _show_prompt_preview_dialog(self):
         """プロンプトプレビューをダイアログで表示"""
         try:
-            from prompts.prompt_loader import PromptLoader
-            prompt_loader = PromptLoader()
+            prompt_loader = get_prompt_loader()
 
             # エージェント選択
             agent_options = [
@@ -267,8 +262,7 @@ class QAApp:
 
     def _generate_system_prompt(self, agent_type: str, level: str = "Standard") -> str:
         """エージェントの実際のシステムプロンプトを生成"""
-        from prompts.prompt_loader import PromptLoader
-        prompt_loader = PromptLoader()
+        prompt_loader = get_prompt_loader()
 
         try:
             return prompt_loader.get_system_prompt(agent_type, level)
@@ -1291,8 +1285,7 @@ class QAApp:
         previous_questions_text = self._format_previous_questions(previous_qa)
 
         # prompt_loaderを使用して動的にユーザープロンプトを生成
-        from prompts.prompt_loader import PromptLoader
-        prompt_loader = PromptLoader()
+        prompt_loader = get_prompt_loader()
 
         # 学生エージェントのレベル設定を取得（デフォルトはStandard）
         question_level = getattr(self.student_agent, 'question_level', 'standard')
@@ -1374,8 +1367,7 @@ class QAApp:
     
     async def _generate_followup_question_async(self, current_answer: str) -> str:
         """フォローアップ質問を非同期生成"""
-        from prompts.prompt_loader import PromptLoader
-        prompt_loader = PromptLoader()
+        prompt_loader = get_prompt_loader()
 
         # followup_question_promptセクションを取得
         prompt_config = prompt_loader.load_prompt("student", "Standard")
@@ -1670,8 +1662,7 @@ class QAApp:
     async def _generate_bulk_questions_with_deduplication(self, section: str, question_level: str,
                                                         question_num: int, previous_questions: list) -> str:
         """重複防止機能付き一括質問生成"""
-        from prompts.prompt_loader import PromptLoader
-        prompt_loader = PromptLoader()
+        prompt_loader = get_prompt_loader()
 
         # 過去の質問をフォーマット
         previous_questions_text = "\n".join([f"- {q}" for q in previous_questions]) if previous_questions else "まだ質問はありません"
@@ -1741,8 +1732,7 @@ class QAApp:
         previous_questions_text = "\n".join([f"- {q}" for q in previous_questions]) if previous_questions else "まだ質問はありません"
 
         # prompt_loaderを使用して動的にユーザープロンプトを生成
-        from prompts.prompt_loader import PromptLoader
-        prompt_loader = PromptLoader()
+        prompt_loader = get_prompt_loader()
 
         # 学生エージェントのレベル設定を取得
         question_level = getattr(self.student_agent, 'question_level', 'standard')
@@ -48,6 +48,9 @@ class Settings:
     # プロンプト設定
     PROMPT_VERSION = "latest"
     
+    # UI設定
+    COMPACT_METRICS = False  # Trueで文書情報・統計を1つの表（st.dataframe）にまとめて表示
+    
     @classmethod
     def validate_api_key(cls):
         """OpenAI APIキーの検証"""
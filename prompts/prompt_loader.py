@@ -1,7 +1,12 @@
 import os
+import re
 import configparser
+from functools import lru_cache
 from typing import Dict, Any
 
+# バージョン別プロンプトファイル名の形式（v1_0_0.ini 形式）
+_VERSION_FILE_RE = re.compile(r'^v(\d+)_(\d+)_(\d+)\.ini$')
+
 class PromptLoader:
     """プロンプトファイル（.ini形式）を読み込むユーティリティクラス"""
 
@@ -81,11 +86,11 @@ class PromptLoader:
         """
         system_cache_key = f"system_{agent_type}_{level}"
 
-        # システムプロンプトのキャッシュを確認
-        if system_cache_key in self._cache:
-            return self._cache[system_cache_key]
-
+        # load_promptはファイル更新時のみ新しい辞書を返すため、同一オブジェクトならキャッシュを使用
         prompt_config = self.load_prompt(agent_type, level)
+        cached = self._cache.get(system_cache_key)
+        if cached is not None and cached[0] is prompt_config:
+            return cached[1]
 
         # システムプロンプトを構築（新しいSystem/User構造）
         system_section = prompt_config.get('system', {})
@@ -130,8 +135,8 @@ class PromptLoader:
 
         system_prompt = "\n".join(system_prompt_parts)
 
-        # システムプロンプトをキャッシュに保存
-        self._cache[system_cache_key] = system_prompt
+        # システムプロンプトを元の設定と組でキャッシュに保存
+        self._cache[system_cache_key] = (prompt_config, system_prompt)
 
         return system_prompt
     
@@ -193,4 +198,33 @@ class PromptLoader:
 
             return sorted(levels)
         except Exception:
-            return []
\ No newline at end of file
+            return []
+
+    def get_available_versions(self, agent_type: str) -> list:
+        """
+        指定されたエージェントタイプで利用可能なバージョンのリストを取得
+
+        Returns:
+            バージョン番号順のリスト（prompt.iniは初期バージョンv1_0_0として扱う）
+        """
+        agent_dir = os.path.join(self.prompts_dir, agent_type)
+        try:
+            file_names = os.listdir(agent_dir)
+        except OSError:
+            return []
+
+        versions = {}
+        if "prompt.ini" in file_names:
+            versions["v1_0_0"] = (1, 0, 0)
+        for file_name in file_names:
+            match = _VERSION_FILE_RE.match(file_name)
+            if match:
+                versions[file_name[:-len(".ini")]] = tuple(int(part) for part in match.groups())
+
+        return sorted(versions, key=versions.get)
+
+
+@lru_cache(maxsize=1)
+def get_prompt_loader() -> PromptLoader:
+    """プロセス全体で共有するPromptLoaderを取得（再実行ごとの再生成を避け、内部キャッシュを保持）"""
+    return PromptLoader()
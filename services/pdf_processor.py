@@ -1,6 +1,7 @@
 import PyPDF2
 import pdf2image
 import io
+import os
 import base64
 from typing import List, Dict, Tuple, Optional
 from PIL import Image
@@ -81,11 +82,14 @@ class PDFProcessor:
         try:
             # PDFを画像に変換
             import platform
+
+            # バイト列は一度だけ読み込み、フォールバック時も同じデータを再利用
+            pdf_bytes = pdf_file.read()
             
             # Windowsの場合、popplerパスを手動で設定を試行
             if platform.system() == "Windows":
                 try:
-                    images = pdf2image.convert_from_bytes(pdf_file.read())
+                    images = pdf2image.convert_from_bytes(pdf_bytes)
                 except Exception as e:
                     # Windowsでpopplerパスエラーの場合のフォールバック
                     import shutil
@@ -107,11 +111,11 @@ class PDFProcessor:
                             break
                     
                     if poppler_path:
-                        images = pdf2image.convert_from_bytes(pdf_file.read(), poppler_path=poppler_path)
+                        images = pdf2image.convert_from_bytes(pdf_bytes, poppler_path=poppler_path)
                     else:
                         raise Exception(f"PDF画像抽出エラー: Popplerが見つかりません。READMEを参照してPopplerをインストールしてください。原因: {str(e)}")
             else:
-                images = pdf2image.convert_from_bytes(pdf_file.read())
+                images = pdf2image.convert_from_bytes(pdf_bytes)
                 
             return images
         
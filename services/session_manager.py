@@ -35,6 +35,13 @@ class SessionManager:
         """文書データを保存"""
         st.session_state.document_data = data
         st.session_state.document_uploaded = True
+
+        # 前の文書のストリーミング表示・追加質問履歴・PDF表示用キャッシュは引き継がない
+        streaming_display = st.session_state.get('streaming_display')
+        if streaming_display is not None:
+            streaming_display.reset()
+        st.session_state.pop('interactive_questions', None)
+        st.session_state.pop('_pdf_b64_cache', None)
     
     @staticmethod
     def get_document_data() -> Dict[str, Any]:
@@ -1,6 +1,238 @@
 import streamlit as st
 from typing import Dict, Any, Optional, List
-import time
+import re
+from contextlib import nullcontext
+from datetime import datetime
+from io import BytesIO
+from auth import logout
+from config.settings import Settings
+from services.session_manager import SessionManager
+
+# python-docxは任意依存（未インストール時はテキスト形式で代替）
+try:
+    from docx import Document
+    _DOCX_AVAILABLE = True
+except ImportError:
+    _DOCX_AVAILABLE = False
+
+# Markdown変換用の正規表現（モジュール読み込み時に一度だけコンパイル）
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+# プレーンテキスト変換で除去する見出し・イタリック・コードの装飾（太字は_BOLD_REを共用）
+_HEADING_MARK_RE = re.compile(r'#+\s*')
+_ITALIC_RE = re.compile(r'\*(.*?)\*')
+_CODE_RE = re.compile(r'`(.*?)`')
+# カンマ区切りの単語（前後の空白を除いた空でない要素のみ）
+_KEYWORD_RE = re.compile(r'[^,\s](?:[^,]*[^,\s])?')
+
+# ヘッダーの説明文
+_HEADER_DESCRIPTION_MD = "PDFをアップロードして、AIエージェントによる対話形式で効果的に理解を深めましょう。"
+
+# GPT-5系のモデル選択肢（表示名, モデルID）
+_GPT5_MODELS = (
+    ('GPT-5', 'gpt-5'),
+    ('GPT-5 Mini', 'gpt-5-mini'),
+    ('GPT-5 Nano', 'gpt-5-nano')
+)
+
+# セレクトボックスの選択肢（表示名）
+_GPT5_MODEL_NAMES = tuple(name for name, _ in _GPT5_MODELS)
+
+# モデル表示名→ID、モデルID→選択肢インデックスの逆引き
+_MODEL_NAME_TO_ID = dict(_GPT5_MODELS)
+_MODEL_ID_TO_INDEX = {model_id: i for i, (_, model_id) in enumerate(_GPT5_MODELS)}
+
+# エージェント別の推奨モデル
+_RECOMMENDED_MODELS = {
+    'student': 'gpt-5-mini',       # 最新軽量モデル
+    'teacher': 'gpt-5',            # 最新最高性能モデル
+    'summarizer': 'gpt-5-nano'     # 最新超軽量モデル
+}
+
+# 質問レベルの設定（表示ラベル→値・説明・表示色）
+_QUESTION_LEVEL_OPTIONS = {
+    "🌱 超初心者": {
+        "value": "beginner",
+        "description": "単語の意味から知りたい",
+        "detail": "専門用語や基本的な概念の意味を聞く質問",
+        "color": "#FF9800"
+    },
+    "🔰 簡単": {
+        "value": "simple",
+        "description": "基本的で理解しやすい質問",
+        "detail": "文書の主要なポイントや基本的な仕組みについての質問",
+        "color": "#4CAF50"
+    },
+    "🎓 詳細": {
+        "value": "latest",
+        "description": "専門的で深い理解を求める質問",
+        "detail": "文書の詳細な分析や論理的な関係性についての質問",
+        "color": "#2196F3"
+    }
+}
+
+# 質問レベルの選択肢（ラジオボタンには毎回同じタプルを渡す）
+_QUESTION_LEVEL_LABELS = tuple(_QUESTION_LEVEL_OPTIONS)
+
+# 選択中の質問レベルの説明カード（レベルごとに事前生成）
+_QUESTION_LEVEL_CARD_HTML = {
+    label: f"""
+        <div style="
+            background: linear-gradient(135deg, {info['color']}15 0%, {info['color']}08 100%);
+            border: 2px solid {info['color']}40;
+            border-radius: 12px;
+            padding: 15px;
+            margin: 10px 0;
+        ">
+            <div style="color: {info['color']}; font-weight: 600; margin-bottom: 8px;">
+                {label}: {info['description']}
+            </div>
+            <div style="color: #666; font-size: 13px; line-height: 1.4;">
+                {info['detail']}
+            </div>
+        </div>
+        """
+    for label, info in _QUESTION_LEVEL_OPTIONS.items()
+}
+
+# メッセージ種別ごとの描画関数と接頭辞
+_MESSAGE_RENDERERS = {
+    'error': st.error,
+    'success': st.success,
+    'warning': st.warning,
+    'info': st.info
+}
+_MESSAGE_PREFIXES = {
+    'error': '❌ エラーが発生しました: ',
+    'success': '✅ ',
+    'warning': '⚠️ ',
+    'info': 'ℹ️ '
+}
+
+def _parse_markdown_blocks(markdown_text: str) -> List[tuple]:
+    """Markdownを (種別, テキスト) のブロック列に変換（連続する通常行は改行で結合）"""
+    blocks = []
+    paragraph_lines = []
+
+    def flush_paragraph():
+        if paragraph_lines:
+            blocks.append(('para', '\n'.join(paragraph_lines)))
+            paragraph_lines.clear()
+
+    for line in markdown_text.split('\n'):
+        line = line.strip()
+        if not line:
+            flush_paragraph()
+            blocks.append(('blank', ''))
+            continue
+
+        # 先頭文字で分岐（通常テキスト行でのstartswith連続判定を回避）
+        c0 = line[0]
+
+        # 見出し処理（先頭の#の連続数でレベルを決定、最大3）
+        if c0 == '#':
+            flush_paragraph()
+            level = min(len(line) - len(line.lstrip('#')), 3)
+            blocks.append(('heading', (level, line[level:].strip())))
+
+        # リスト処理（太字マークは除去）
+        elif c0 in '-*' and line[1:2] == ' ':
+            flush_paragraph()
+            blocks.append(('bullet', _BOLD_RE.sub(r'\1', line[2:].strip())))
+
+        # 通常のテキスト
+        else:
+            paragraph_lines.append(line)
+
+    flush_paragraph()
+    return blocks
+
+# スケルトンローディング用の静的HTML（.shimmer のスタイルと keyframes は StyleManager.apply_custom_styles で定義）
+_SKELETON_SUMMARY_HTML = """
+<div class="shimmer"></div>
+<div class="shimmer" style="width: 85%;"></div>
+<div class="shimmer" style="width: 92%;"></div>
+"""
+
+_SKELETON_QA_HTML = """
+<div class="shimmer shimmer-sm" style="width: 70%;"></div>
+<div class="shimmer shimmer-sm" style="margin: 8px 0;"></div>
+<div class="shimmer shimmer-sm" style="width: 88%;"></div>
+"""
+
+# Q&Aスケルトン3件分を1つのHTMLにまとめる（折りたたみはst.expanderの代わりに<details>で表現）
+_SKELETON_QA_SECTION_HTML = "\n".join(
+    f"<details><summary>❓ Q{i}: 質問を生成中...</summary>{_SKELETON_QA_HTML}</details>"
+    for i in range(1, 4)
+)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _convert_markdown_to_word_content(markdown_text: str, generated_at: str) -> bytes:
+    """MarkdownテキストをWord文書に変換（レポート内容と生成日時をキーにキャッシュ）"""
+    if not _DOCX_AVAILABLE:
+        # python-docxが利用できない場合はテキスト形式で返す
+        st.warning("Word形式の出力にはpython-docxライブラリが必要です。テキスト形式でダウンロードしてください。")
+        return _convert_markdown_to_text(markdown_text, generated_at).encode('utf-8')
+
+    try:
+        doc = Document()
+
+        # ドキュメントのタイトル
+        doc.add_heading('AI Q&Aセッション レポート', 0)
+
+        # 生成日時を追加
+        date_paragraph = doc.add_paragraph(f"生成日時: {generated_at}")
+        date_paragraph.runs[0].italic = True
+
+        doc.add_paragraph()  # 空行
+
+        # Markdownを (種別, テキスト) のブロック列に変換し、連続する通常行は1段落にまとめる
+        for kind, text in _parse_markdown_blocks(markdown_text):
+            if kind == 'blank':
+                doc.add_paragraph()  # 空行
+            elif kind == 'heading':
+                level, heading = text
+                doc.add_heading(heading, level=level)
+            elif kind == 'bullet':
+                doc.add_paragraph(text, style='List Bullet')
+            elif '**' in text:
+                # 太字処理（finditerで通常部分と太字部分を1パスで追加）
+                p = doc.add_paragraph()
+                pos = 0
+                for match in _BOLD_RE.finditer(text):
+                    if match.start() > pos:
+                        p.add_run(text[pos:match.start()])
+                    p.add_run(match.group(1)).bold = True
+                    pos = match.end()
+                if pos < len(text):
+                    p.add_run(text[pos:])
+            else:
+                doc.add_paragraph(text)
+
+        # バイト形式で保存
+        buffer = BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+
+    except Exception as e:
+        st.error(f"Word形式への変換エラー: {str(e)}")
+        return _convert_markdown_to_text(markdown_text, generated_at).encode('utf-8')
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _convert_markdown_to_text(markdown_text: str, generated_at: str) -> str:
+    """Markdownテキストをプレーンテキストに変換（レポート内容と生成日時をキーにキャッシュ）"""
+    # ヘッダーを追加
+    result = f"AI Q&Aセッション レポート\n"
+    result += f"生成日時: {generated_at}\n"
+    result += "=" * 50 + "\n\n"
+
+    # Markdownの装飾を除去（前の置換結果に次の置換を適用するため順序を保つ）
+    text = _HEADING_MARK_RE.sub('', markdown_text)  # 見出しマークを除去
+    text = _BOLD_RE.sub(r'\1', text)  # 太字マークを除去
+    text = _ITALIC_RE.sub(r'\1', text)  # イタリックマークを除去
+    text = _CODE_RE.sub(r'\1', text)  # コードマークを除去
+
+    result += text
+    return result
 
 class UIComponents:
     """再利用可能なUIコンポーネント"""
@@ -9,107 +241,114 @@ class UIComponents:
     def render_header():
         """アプリケーションヘッダーを描画"""
         st.title("🎓 SkimMateAgent")
-        st.markdown("""
-        PDFをアップロードして、AIエージェントによる対話形式で効果的に理解を深めましょう。
-        """)
+        st.markdown(_HEADER_DESCRIPTION_MD)
     
     def render_sidebar_settings(self) -> Dict[str, Any]:
         """サイドバーに設定を描画"""
-        from services.session_manager import SessionManager
-
+        # フラグメント内でst.sidebarは呼べないため、sidebarコンテキスト内でフラグメントを呼び出す
         with st.sidebar:
-            # 設定ロック状態を確認
-            is_locked = SessionManager.is_settings_locked()
+            self._render_sidebar_fragment()
 
-            # ロック時のヘッダー
-            if is_locked:
-                st.header("🔒 設定（処理中のためロック）")
-                st.warning("⚠️ Q&A処理中は設定を変更できません")
-            else:
-                st.header("⚙️ 設定")
+        return st.session_state.get('sidebar_settings', {})
 
-            # 設定コンテナ（ロック時は無効化）
-            with st.container():
-                # 処理モード設定
-                st.subheader("⚡ 処理モード")
-                processing_settings = self.render_processing_mode_sidebar(disabled=is_locked)
+    @st.fragment
+    def _render_sidebar_fragment(self):
+        """サイドバー設定をフラグメントとして描画（ウィジェット操作時はサイドバーのみ再実行）"""
+        # 設定ロック状態を確認
+        is_locked = SessionManager.is_settings_locked()
 
-                st.divider()
+        # ロック時のヘッダー
+        if is_locked:
+            st.header("🔒 設定（処理中のためロック）")
+            st.warning("⚠️ Q&A処理中は設定を変更できません")
+        else:
+            st.header("⚙️ 設定")
 
-                # Q&A設定
-                st.subheader("💬 Q&A設定")
-                qa_settings = self.render_basic_qa_settings_sidebar(disabled=is_locked)
+        # 設定コンテナ（ロック時は無効化）
+        with st.container():
+            # 処理モード設定
+            st.subheader("⚡ 処理モード")
+            processing_settings = self.render_processing_mode_sidebar(disabled=is_locked)
 
-                st.divider()
+            st.divider()
 
-                # フォローアップ設定
-                st.subheader("🔄 フォローアップ")
-                followup_settings = self.render_followup_settings_sidebar(disabled=is_locked)
+            # Q&A設定
+            st.subheader("💬 Q&A設定")
+            qa_settings = self.render_basic_qa_settings_sidebar(disabled=is_locked)
 
-                st.divider()
+            st.divider()
 
-                # 重要単語設定
-                st.subheader("📝 重要単語設定")
-                keyword_settings = self.render_keyword_settings_sidebar(qa_settings.get('qa_turns', 10), disabled=is_locked)
+            # フォローアップ設定
+            st.subheader("🔄 フォローアップ")
+            followup_settings = self.render_followup_settings_sidebar(disabled=is_locked)
 
-                st.divider()
+            st.divider()
 
-            # リセットボタンのスタイルを追加
-            st.markdown("""
-            <style>
-            /* サイドバーリセットボタンのスタイル */
-            div[data-testid="stSidebar"] div[data-testid="stButton"] > button {
-                background: linear-gradient(135deg, rgba(173, 216, 230, 0.4) 0%, rgba(135, 206, 235, 0.5) 50%, rgba(176, 224, 230, 0.4) 100%) !important;
-                border: 1px solid rgba(173, 216, 230, 0.6) !important;
-                border-radius: 12px !important;
-                color: #2c5aa0 !important;
-                font-weight: 500 !important;
-                backdrop-filter: blur(10px) !important;
-                -webkit-backdrop-filter: blur(10px) !important;
-                box-shadow:
-                    0 2px 8px rgba(173, 216, 230, 0.3),
-                    inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
-                transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-            }
+            # 重要単語設定
+            st.subheader("📝 重要単語設定")
+            keyword_settings = self.render_keyword_settings_sidebar(qa_settings.get('qa_turns', 10), disabled=is_locked)
 
-            div[data-testid="stSidebar"] div[data-testid="stButton"] > button:hover {
-                background: linear-gradient(135deg, rgba(173, 216, 230, 0.6) 0%, rgba(135, 206, 235, 0.7) 50%, rgba(176, 224, 230, 0.6) 100%) !important;
-                transform: translateY(-2px) !important;
-                box-shadow:
-                    0 4px 16px rgba(173, 216, 230, 0.4),
-                    inset 0 1px 0 rgba(255, 255, 255, 0.3) !important;
-            }
-            </style>
-            """, unsafe_allow_html=True)
+            st.divider()
+
+        # リセットボタンのスタイルを追加
+        st.markdown("""
+        <style>
+        /* サイドバーリセットボタンのスタイル */
+        div[data-testid="stSidebar"] div[data-testid="stButton"] > button {
+            background: linear-gradient(135deg, rgba(173, 216, 230, 0.4) 0%, rgba(135, 206, 235, 0.5) 50%, rgba(176, 224, 230, 0.4) 100%) !important;
+            border: 1px solid rgba(173, 216, 230, 0.6) !important;
+            border-radius: 12px !important;
+            color: #2c5aa0 !important;
+            font-weight: 500 !important;
+            backdrop-filter: blur(10px) !important;
+            -webkit-backdrop-filter: blur(10px) !important;
+            box-shadow:
+                0 2px 8px rgba(173, 216, 230, 0.3),
+                inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
+            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+        }
+
+        div[data-testid="stSidebar"] div[data-testid="stButton"] > button:hover {
+            background: linear-gradient(135deg, rgba(173, 216, 230, 0.6) 0%, rgba(135, 206, 235, 0.7) 50%, rgba(176, 224, 230, 0.6) 100%) !important;
+            transform: translateY(-2px) !important;
+            box-shadow:
+                0 4px 16px rgba(173, 216, 230, 0.4),
+                inset 0 1px 0 rgba(255, 255, 255, 0.3) !important;
+        }
+        </style>
+        """, unsafe_allow_html=True)
 
-            # リセットボタン（常時表示）
-            if st.button("🔄 セッションをリセット", use_container_width=True, help="すべての設定と処理状態を初期化します"):
-                from services.session_manager import SessionManager
-                # 認証状態を保持
-                password_correct = st.session_state.get("password_correct", False)
+        # リセットボタン（常時表示）
+        if st.button("🔄 セッションをリセット", use_container_width=True, help="すべての設定と処理状態を初期化します"):
+            # 認証状態を保持
+            password_correct = st.session_state.get("password_correct", False)
 
-                # セッション全体をリセット
-                for key in list(st.session_state.keys()):
-                    del st.session_state[key]
+            # セッション全体をリセット
+            for key in list(st.session_state.keys()):
+                del st.session_state[key]
 
-                # 認証状態を復元（ログイン済み状態を維持）
-                st.session_state["password_correct"] = password_correct
+            # 認証状態を復元（ログイン済み状態を維持）
+            st.session_state["password_correct"] = password_correct
 
-                SessionManager.initialize_session()
-                SessionManager.unlock_settings()  # 設定ロックも解除
-                SessionManager.stop_processing()  # 処理状態もリセット
-                st.success("✅ セッションをリセットしました")
-                st.rerun()
+            SessionManager.initialize_session()
+            SessionManager.unlock_settings()  # 設定ロックも解除
+            SessionManager.stop_processing()  # 処理状態もリセット
+            st.success("✅ セッションをリセットしました")
+            st.rerun()
 
-            # ログアウトボタン
-            if st.button("🔓 ログアウト", use_container_width=True):
-                from auth import logout
-                logout()
+        # ログアウトボタン
+        if st.button("🔓 ログアウト", use_container_width=True):
+            logout()
 
-            # 設定を統合して返す（モデル設定は空の辞書）
-            model_settings = {}
-            settings = {**processing_settings, **qa_settings, **followup_settings, **keyword_settings, **model_settings}
-            return settings
+        # 設定を統合して返す（モデル設定はサイドバーでは扱わない）
+        settings = {}
+        settings.update(processing_settings)
+        settings.update(qa_settings)
+        settings.update(followup_settings)
+        settings.update(keyword_settings)
+
+        # フラグメント再実行時は戻り値が使われないため、セッション状態に保存
+        st.session_state['sidebar_settings'] = settings
 
 
     def render_processing_mode_sidebar(self, disabled: bool = False) -> Dict[str, Any]:
@@ -211,59 +450,19 @@ class UIComponents:
         # 質問レベル設定
         st.markdown("### 📚 質問レベル")
 
-        level_options = {
-            "🌱 超初心者": {
-                "value": "beginner",
-                "description": "単語の意味から知りたい",
-                "detail": "専門用語や基本的な概念の意味を聞く質問",
-                "color": "#FF9800"
-            },
-            "🔰 簡単": {
-                "value": "simple",
-                "description": "基本的で理解しやすい質問",
-                "detail": "文書の主要なポイントや基本的な仕組みについての質問",
-                "color": "#4CAF50"
-            },
-            "🎓 詳細": {
-                "value": "latest",
-                "description": "専門的で深い理解を求める質問",
-                "detail": "文書の詳細な分析や論理的な関係性についての質問",
-                "color": "#2196F3"
-            }
-        }
-
-        # デフォルトは超初心者レベル
-        default_level = "🌱 超初心者"
-
         selected_level = st.radio(
             "質問の難易度を選択",
-            options=list(level_options.keys()),
-            index=0,  # デフォルトで簡単レベル
+            options=_QUESTION_LEVEL_LABELS,
+            index=0,  # デフォルトは超初心者レベル
             disabled=disabled,
             key="sidebar_question_level",
             help="学生エージェントが生成する質問の難易度を選択します"
         )
 
-        settings['question_level'] = level_options[selected_level]["value"]
+        settings['question_level'] = _QUESTION_LEVEL_OPTIONS[selected_level]["value"]
 
         # 選択されたレベルの説明を表示
-        selected_info = level_options[selected_level]
-        st.markdown(f"""
-        <div style="
-            background: linear-gradient(135deg, {selected_info['color']}15 0%, {selected_info['color']}08 100%);
-            border: 2px solid {selected_info['color']}40;
-            border-radius: 12px;
-            padding: 15px;
-            margin: 10px 0;
-        ">
-            <div style="color: {selected_info['color']}; font-weight: 600; margin-bottom: 8px;">
-                {selected_level}: {selected_info['description']}
-            </div>
-            <div style="color: #666; font-size: 13px; line-height: 1.4;">
-                {selected_info['detail']}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_QUESTION_LEVEL_CARD_HTML[selected_level], unsafe_allow_html=True)
 
         st.markdown('</div>', unsafe_allow_html=True)
         return settings
@@ -434,9 +633,18 @@ class UIComponents:
             disabled=disabled
         )
 
-        keywords = []
-        if keyword_input.strip():
-            keywords = [kw.strip() for kw in keyword_input.split(',') if kw.strip()]
+        # 入力文字列が変わった時のみ単語リストと表示用プレビューを再構築
+        raw = keyword_input.strip()
+        cache = st.session_state.setdefault('_keyword_cache', {})
+        if cache.get('raw') != raw:
+            keywords = _KEYWORD_RE.findall(raw)
+            keyword_preview = ', '.join(keywords[:3])
+            if len(keywords) > 3:
+                keyword_preview += f" など{len(keywords)}個"
+            cache['raw'] = raw
+            cache['keywords'] = keywords
+            cache['preview'] = keyword_preview
+        keywords = cache['keywords']
 
         settings['target_keywords'] = keywords
 
@@ -500,10 +708,7 @@ class UIComponents:
             </div>
             """, unsafe_allow_html=True)
         elif keywords:
-            keyword_preview = ', '.join(keywords[:3])
-            if len(keywords) > 3:
-                keyword_preview += f" など{len(keywords)}個"
-
+            keyword_preview = cache['preview']
             recommended_ratio = min(len(keywords) / qa_turns, 0.5)
 
             st.markdown(f"""
@@ -587,25 +792,10 @@ class UIComponents:
         """サイドバー用モデル設定を描画"""
         settings = {}
 
-        # GPT-5系のみに制限
-        gpt5_models = [
-            ('GPT-5', 'gpt-5'),
-            ('GPT-5 Mini', 'gpt-5-mini'),
-            ('GPT-5 Nano', 'gpt-5-nano')
-        ]
-
-        # 推奨モデル設定
-        recommended_models = {
-            'student': 'gpt-5-mini',
-            'teacher': 'gpt-5',
-            'summarizer': 'gpt-5-nano'
-        }
-
         # 学生エージェントモデル
         student_model = self._render_model_selector_sidebar(
             "sidebar_student_model",
-            gpt5_models,
-            recommended_models['student'],
+            _RECOMMENDED_MODELS['student'],
             "🎓 学生モデル"
         )
         settings['student_model'] = student_model
@@ -613,8 +803,7 @@ class UIComponents:
         # 教師エージェントモデル
         teacher_model = self._render_model_selector_sidebar(
             "sidebar_teacher_model",
-            gpt5_models,
-            recommended_models['teacher'],
+            _RECOMMENDED_MODELS['teacher'],
             "👨‍🏫 教師モデル"
         )
         settings['teacher_model'] = teacher_model
@@ -622,8 +811,7 @@ class UIComponents:
         # 要約エージェントモデル
         summarizer_model = self._render_model_selector_sidebar(
             "sidebar_summarizer_model",
-            gpt5_models,
-            recommended_models['summarizer'],
+            _RECOMMENDED_MODELS['summarizer'],
             "📋 要約モデル"
         )
         settings['summarizer_model'] = summarizer_model
@@ -631,31 +819,24 @@ class UIComponents:
         return settings
 
 
-    def _render_model_selector_sidebar(self, key: str, model_options: list, default_model: str, label: str) -> str:
+    def _render_model_selector_sidebar(self, key: str, default_model: str, label: str) -> str:
         """サイドバー用モデル選択セレクトボックスを描画"""
         # セッション状態から現在の値を取得（初回はデフォルト値）
-        if key not in st.session_state:
-            st.session_state[key] = default_model
-
-        current_value = st.session_state[key]
+        current_value = st.session_state.setdefault(key, default_model)
 
         # 現在の値に対応するインデックスを取得
-        default_index = 0
-        for i, (name, model_id) in enumerate(model_options):
-            if model_id == current_value:
-                default_index = i
-                break
+        default_index = _MODEL_ID_TO_INDEX.get(current_value, 0)
 
         # selectboxで選択されたモデル名を取得
         selected_model_name = st.selectbox(
             label,
-            options=[name for name, _ in model_options],
+            options=_GPT5_MODEL_NAMES,
             index=default_index,
             key=f"{key}_selectbox"  # キーの重複を避けるため
         )
 
         # 選択されたモデルIDを取得してセッション状態を更新
-        selected_model_id = next(model_id for name, model_id in model_options if name == selected_model_name)
+        selected_model_id = _MODEL_NAME_TO_ID[selected_model_name]
         st.session_state[key] = selected_model_id
 
         return selected_model_id
@@ -769,170 +950,6 @@ class UIComponents:
 
         return result
     
-
-    def render_qa_settings(self, disabled: bool = False) -> Dict[str, Any]:
-        """Q&A設定を描画"""
-        from services.openai_service import OpenAIService
-        
-        st.subheader("⚙️ Q&A設定")
-        
-        settings = {}
-        
-        # Q&Aターン数設定
-        settings['qa_turns'] = st.slider(
-            "Q&Aターン数",
-            min_value=1,
-            max_value=20,
-            value=10,
-            step=1,
-            help="生成するQ&Aペアの数を設定してください",
-            disabled=disabled
-        )
-        
-        # エージェント別モデル選択
-        with st.expander("🤖 エージェント別モデル設定", expanded=False):
-            # GPT-5系のみに制限
-            gpt5_models = [
-                ('GPT-5', 'gpt-5'),
-                ('GPT-5 Mini', 'gpt-5-mini'),
-                ('GPT-5 Nano', 'gpt-5-nano')
-            ]
-
-            # 推奨モデル設定（GPT-5系）
-            recommended_models = {
-                'student': 'gpt-5-mini',       # 最新軽量モデル
-                'teacher': 'gpt-5',            # 最新最高性能モデル
-                'summarizer': 'gpt-5-nano'     # 最新超軽量モデル
-            }
-
-            # 3つのカラムに分けて表示
-            col1, col2, col3 = st.columns(3)
-
-            with col1:
-                st.markdown("**🎓 学生エージェント**")
-                st.caption("質問生成担当")
-                student_model = self._render_model_selector(
-                    "student_model",
-                    gpt5_models,
-                    recommended_models['student'],
-                    "質問生成に使用するモデル。軽量モデルでも十分な性能を発揮します。"
-                )
-                settings['student_model'] = student_model
-
-            with col2:
-                st.markdown("**👨‍🏫 教師エージェント**")
-                st.caption("回答生成担当")
-                teacher_model = self._render_model_selector(
-                    "teacher_model",
-                    gpt5_models,
-                    recommended_models['teacher'],
-                    "回答生成に使用するモデル。複雑な内容に対応するため高性能モデルを推奨。"
-                )
-                settings['teacher_model'] = teacher_model
-
-            with col3:
-                st.markdown("**📋 要約エージェント**")
-                st.caption("要約・レポート作成担当")
-                summarizer_model = self._render_model_selector(
-                    "summarizer_model",
-                    gpt5_models,
-                    recommended_models['summarizer'],
-                    "要約とレポート作成に使用するモデル。軽量モデルでも十分な性能を発揮します。"
-                    )
-                settings['summarizer_model'] = summarizer_model
-                    
-        # フォローアップ設定
-        st.divider()
-        st.markdown("**🔄 フォローアップ質問設定**")
-        
-        settings['enable_followup'] = st.checkbox(
-            "フォローアップ質問を有効にする",
-            value=True,
-            key="enable_followup_checkbox",
-            help="回答が専門的すぎる場合に、より理解しやすい説明を求める追加質問を自動生成します"
-        )
-        
-        if settings['enable_followup']:
-            # 複雑さ閾値の設定
-            settings['followup_threshold'] = st.slider(
-                "フォローアップ質問の発動閾値", 
-                min_value=0.1,
-                max_value=1.0,
-                value=0.3,
-                step=0.1,
-                help="回答の複雑さがこの閾値を超えた場合にフォローアップ質問を生成します"
-            )
-            
-            # 最大フォローアップ数の設定
-            settings['max_followups'] = st.slider(
-                "最大フォローアップ質問数",
-                min_value=0,
-                max_value=3,
-                value=1,
-                step=1,
-                help="1つのQ&Aペアに対する最大フォローアップ質問数"
-            )
-        else:
-            # フォローアップ無効時のデフォルト値
-            settings['followup_threshold'] = 0.3  # 調整後のデフォルト値
-            settings['max_followups'] = 0
-
-        st.divider()
-        
-        # 単語登録設定
-        st.markdown("**📝 重要単語登録**")
-        st.caption("指定した単語について必ず質問を生成します（登録単語数 < Q&Aターン数 にしてください）")
-        
-        # 単語入力
-        keyword_input = st.text_input(
-            "重要単語を入力（カンマ区切りで複数入力可能）",
-            placeholder="例: 機械学習, ニューラルネットワーク, 深層学習",
-            help="これらの単語について優先的に質問が生成されます",
-            disabled=disabled
-        )
-        
-        # 入力された単語をリストに変換
-        keywords = []
-        if keyword_input.strip():
-            keywords = [kw.strip() for kw in keyword_input.split(',') if kw.strip()]
-        
-        settings['target_keywords'] = keywords
-        
-        # 登録単語数とQ&Aターン数の関係をチェック
-        qa_turns = settings.get('qa_turns', 10)
-        if keywords and len(keywords) >= qa_turns:
-            st.warning(f"⚠️ 登録単語数({len(keywords)})がQ&Aターン数({qa_turns})以上です。単語を減らすかターン数を増やしてください。")
-        elif keywords:
-            st.success(f"✅ {len(keywords)}個の単語を登録: {', '.join(keywords[:3])}{'...' if len(keywords) > 3 else ''}")
-        
-        return settings
-    
-    def _render_model_selector(self, key: str, model_options: list, default_model: str, help_text: str) -> str:
-        """モデル選択セレクトボックスを描画"""
-        # セッション状態に値がある場合はそれを使用、なければデフォルト値
-        current_value = st.session_state.get(key, default_model)
-        
-        # デフォルトモデルのインデックスを取得
-        default_index = 0
-        for i, (name, model_id) in enumerate(model_options):
-            if model_id == current_value:
-                default_index = i
-                break
-        
-        selected_model_name = st.selectbox(
-            "モデル選択",
-            options=[name for name, _ in model_options],
-            index=default_index,
-            key=key,
-            help=help_text
-        )
-        
-        # 選択されたモデルのIDを取得
-        selected_model_id = next(model_id for name, model_id in model_options if name == selected_model_name)
-        st.caption(f"💡 {selected_model_id}")
-        
-        return selected_model_id
-    
     @staticmethod
     def render_document_info(doc_data: Dict[str, Any]):
         """文書情報を表示"""
@@ -946,28 +963,19 @@ class UIComponents:
 
         if source_type == 'text':
             # テキスト入力の場合は文字数のみ表示
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.metric("文字数", f"{doc_data.get('char_count', 0):,}")
-
-            with col2:
-                split_status = "テキスト入力"
-                st.metric("入力形式", split_status)
+            UIComponents.render_metrics([
+                ("文字数", f"{doc_data.get('char_count', 0):,}"),
+                ("入力形式", "テキスト入力")
+            ])
 
         else:
             # PDF入力の場合は従来の表示
-            col1, col2, col3 = st.columns(3)
-
-            with col1:
-                st.metric("ページ数", doc_data.get('page_count', 0))
-
-            with col2:
-                st.metric("トークン数", f"{doc_data.get('total_tokens', 0):,}")
-
-            with col3:
-                split_status = "分割済み" if doc_data.get('is_split', False) else "未分割"
-                st.metric("処理状況", split_status)
+            split_status = "分割済み" if doc_data.get('is_split', False) else "未分割"
+            UIComponents.render_metrics([
+                ("ページ数", doc_data.get('page_count', 0)),
+                ("トークン数", f"{doc_data.get('total_tokens', 0):,}"),
+                ("処理状況", split_status)
+            ])
 
             # トークン数による警告
             if doc_data.get('total_tokens', 0) > 200000:
@@ -975,10 +983,10 @@ class UIComponents:
     
     @staticmethod
     def render_progress_indicator(show: bool, text: str):
-        """プログレスインジケーターを表示"""
+        """プログレスインジケーターを返す（with文で処理を囲んでいる間だけスピナーを表示）"""
         if show:
-            with st.spinner(text):
-                time.sleep(0.1)  # UI更新のため短時間待機
+            return st.spinner(text)
+        return nullcontext()
     
     @staticmethod
     def render_summary_section(summary: str):
@@ -998,14 +1006,66 @@ class UIComponents:
         
         return qa_container
     
+    @staticmethod
+    def format_qa_title(pair_number: int, question: str, limit: int = 50) -> str:
+        """Q&Aエキスパンダーのタイトルを生成（limit文字を超える場合のみ省略記号を付与）"""
+        return f"Q{pair_number}: {question[:limit]}{'...' if len(question) > limit else ''}"
+
     @staticmethod
     def render_qa_pair(container, question: str, answer: str, pair_number: int):
         """Q&Aペアを表示"""
         with container:
-            with st.expander(f"Q{pair_number}: {question[:50]}...", expanded=True):
-                st.markdown(f"**質問：** {question}")
-                st.markdown(f"**回答：** {answer}")
+            with st.expander(UIComponents.format_qa_title(pair_number, question), expanded=True):
+                # 質問と回答を1つのMarkdownにまとめて描画（GFMの表示はst.markdownのまま維持）
+                st.markdown(f"**質問：** {question}\n\n**回答：** {answer}")
     
+    @staticmethod
+    def _build_qa_markdown(pair_number: int, qa_pair: Dict[str, Any]) -> str:
+        """Q&Aペア（フォローアップとキャプション情報を含む）をエキスパンダー本文用の1つのMarkdownにまとめる"""
+        get = qa_pair.get
+        i = pair_number
+        blocks = [
+            f"**❓ Q{i} (メイン質問):**", get('question', '質問なし'),
+            f"**💡 A{i}:**", get('answer', '回答なし')
+        ]
+
+        followup_question = get('followup_question', '')
+        if followup_question:
+            # フォローアップ質問を関連性を明確にして表示
+            blocks += [
+                "---",
+                f"**🔄 Q{i}-1 (フォローアップ):**", followup_question,
+                f"**💡 A{i}-1:**", get('followup_answer', '')
+            ]
+
+        # キャプション情報（タイムスタンプと専門性スコア、st.captionの代わりに灰色の文字で表示）
+        caption_parts = []
+        timestamp = get('timestamp', '')
+        if timestamp:
+            caption_parts.append(f"生成時刻: {timestamp}")
+        complexity_score = get('complexity_score', 'N/A')
+        if complexity_score != 'N/A':
+            caption_parts.append(f"専門性: {complexity_score}")
+        if caption_parts:
+            blocks.append(f":gray[{' | '.join(caption_parts)}]")
+
+        return "\n\n".join(blocks)
+
+    @staticmethod
+    def render_qa_history(qa_pairs: List[Dict[str, Any]]):
+        """完了済みQ&Aペアの一覧を表示（エキスパンダーごとに本文を1回のst.markdownで描画）"""
+        for i, qa_pair in enumerate(qa_pairs, 1):
+            question = qa_pair.get('question', '質問なし')
+
+            # フォローアップがある場合はタイトルに含める
+            if qa_pair.get('followup_question'):
+                title = f"{UIComponents.format_qa_title(i, question, 30)} (+フォローアップ)"
+            else:
+                title = UIComponents.format_qa_title(i, question)
+
+            with st.expander(title, expanded=False):
+                st.markdown(UIComponents._build_qa_markdown(i, qa_pair))
+
     @staticmethod
     def render_final_report(report: str):
         """最終レポートを表示"""
@@ -1013,144 +1073,49 @@ class UIComponents:
             st.subheader("📊 最終レポート")
             st.markdown(report)
 
-            # エクスポートボタン
+            # エクスポートボタン（変換結果はレポート内容と生成日時ごとにキャッシュ済み、キー固定でウィジェットを再利用）
+            # 生成日時はキャッシュの外で取得し、別セッションの古い日時が出力されないようにする
+            generated_at = datetime.now().strftime('%Y年%m月%d日 %H:%M')
             col1, col2 = st.columns(2)
 
             with col1:
                 # Word形式でダウンロード
-                word_content = UIComponents._convert_markdown_to_word_content(report)
                 st.download_button(
                     label="📄 Wordでダウンロード",
-                    data=word_content,
+                    data=_convert_markdown_to_word_content(report, generated_at),
                     file_name="QA_Report.docx",
                     mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                    key="report_download_docx",
                     help="レポートをWord文書形式でダウンロードします"
                 )
 
             with col2:
                 # テキスト形式でダウンロード（バックアップ）
-                text_content = UIComponents._convert_markdown_to_text(report)
                 st.download_button(
                     label="📝 テキストでダウンロード",
-                    data=text_content,
+                    data=_convert_markdown_to_text(report, generated_at),
                     file_name="QA_Report.txt",
                     mime="text/plain",
+                    key="report_download_txt",
                     help="レポートをテキスト形式でダウンロードします"
                 )
 
-    @staticmethod
-    def _convert_markdown_to_word_content(markdown_text: str) -> bytes:
-        """MarkdownテキストをWord文書に変換"""
-        try:
-            from docx import Document
-            from docx.shared import Inches
-            import re
-
-            doc = Document()
-
-            # ドキュメントのタイトル
-            title = doc.add_heading('AI Q&Aセッション レポート', 0)
-
-            # 現在の日時を追加
-            from datetime import datetime
-            date_paragraph = doc.add_paragraph(f"生成日時: {datetime.now().strftime('%Y年%m月%d日 %H:%M')}")
-            date_paragraph.runs[0].italic = True
-
-            doc.add_paragraph()  # 空行
-
-            # Markdownを解析してWord文書に変換
-            lines = markdown_text.split('\n')
-            current_list = None
-
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    doc.add_paragraph()  # 空行
-                    continue
-
-                # 見出し処理
-                if line.startswith('###'):
-                    doc.add_heading(line[3:].strip(), level=3)
-                elif line.startswith('##'):
-                    doc.add_heading(line[2:].strip(), level=2)
-                elif line.startswith('#'):
-                    doc.add_heading(line[1:].strip(), level=1)
-
-                # リスト処理
-                elif line.startswith('- ') or line.startswith('* '):
-                    text = line[2:].strip()
-                    # 太字処理
-                    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-                    doc.add_paragraph(text, style='List Bullet')
-
-                # 通常のテキスト
-                else:
-                    # 太字処理
-                    if '**' in line:
-                        p = doc.add_paragraph()
-                        parts = re.split(r'\*\*(.*?)\*\*', line)
-                        for i, part in enumerate(parts):
-                            if i % 2 == 0:
-                                p.add_run(part)
-                            else:
-                                p.add_run(part).bold = True
-                    else:
-                        doc.add_paragraph(line)
-
-            # バイト形式で保存
-            from io import BytesIO
-            word_buffer = BytesIO()
-            doc.save(word_buffer)
-            word_buffer.seek(0)
-
-            return word_buffer.getvalue()
-
-        except ImportError:
-            # python-docxが利用できない場合はテキスト形式で返す
-            st.warning("Word形式の出力にはpython-docxライブラリが必要です。テキスト形式でダウンロードしてください。")
-            return UIComponents._convert_markdown_to_text(markdown_text).encode('utf-8')
-        except Exception as e:
-            st.error(f"Word形式への変換エラー: {str(e)}")
-            return UIComponents._convert_markdown_to_text(markdown_text).encode('utf-8')
-
-    @staticmethod
-    def _convert_markdown_to_text(markdown_text: str) -> str:
-        """Markdownテキストをプレーンテキストに変換"""
-        import re
-        from datetime import datetime
-
-        # ヘッダーを追加
-        result = f"AI Q&Aセッション レポート\n"
-        result += f"生成日時: {datetime.now().strftime('%Y年%m月%d日 %H:%M')}\n"
-        result += "=" * 50 + "\n\n"
-
-        # Markdownの装飾を除去
-        text = re.sub(r'#+\s*', '', markdown_text)  # 見出しマークを除去
-        text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # 太字マークを除去
-        text = re.sub(r'\*(.*?)\*', r'\1', text)  # イタリックマークを除去
-        text = re.sub(r'`(.*?)`', r'\1', text)  # コードマークを除去
-
-        result += text
-        return result
-
     @staticmethod
     def generate_quick_report(summary: str, qa_pairs: list, document_info: dict = None) -> str:
         """Quickモード用の簡易レポートを生成"""
-        from datetime import datetime
-
         # レポートヘッダー
-        report = f"""# AI文書要約・Q&Aセッション レポート
+        parts = [f"""# AI文書要約・Q&Aセッション レポート
 
 **生成日時**: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}
 **処理モード**: Quickモード
 
 ---
 
-"""
+"""]
 
         # 文書情報
         if document_info:
-            report += f"""## 📋 文書情報
+            parts.append(f"""## 📋 文書情報
 
 - **ページ数**: {document_info.get('page_count', 'N/A')}
 - **トークン数**: {document_info.get('total_tokens', 'N/A'):,}
@@ -1158,100 +1123,116 @@ class UIComponents:
 
 ---
 
-"""
+""")
 
         # 要約セクション
         if summary:
-            report += f"""## 📄 文書要約
+            parts.append(f"""## 📄 文書要約
 
 {summary}
 
 ---
 
-"""
+""")
 
         # Q&Aセクション
         if qa_pairs:
-            report += """## 💬 Q&Aセッション
+            parts.append("""## 💬 Q&Aセッション
 
-"""
+""")
+            separator = "---\n\n"
             for i, qa_pair in enumerate(qa_pairs, 1):
-                question = qa_pair.get('question', '質問なし')
-                answer = qa_pair.get('answer', '回答なし')
+                get = qa_pair.get
+                question = get('question', '質問なし')
+                answer = get('answer', '回答なし')
+                followup_question = get('followup_question', '')
+                followup_answer = get('followup_answer', '')
 
-                report += f"""### Q{i}: {question}
+                parts.append(f"""### Q{i}: {question}
 
 **回答**: {answer}
 
-"""
+""")
 
                 # フォローアップがある場合
-                followup_question = qa_pair.get('followup_question', '')
-                followup_answer = qa_pair.get('followup_answer', '')
-
                 if followup_question and followup_answer:
-                    report += f"""**追加質問**: {followup_question}
+                    parts.append(f"""**追加質問**: {followup_question}
 
 **追加回答**: {followup_answer}
 
-"""
+""")
 
-                report += "---\n\n"
+                parts.append(separator)
 
         # フッター
-        report += f"""## 📊 セッション統計
+        parts.append(f"""## 📊 セッション統計
 
 - **総Q&A数**: {len(qa_pairs)}
 - **処理完了**: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}
 - **処理モード**: Quickモード（AI最終レポート生成なし）
 
 *このレポートはQuickモードで生成されました。詳細な分析や洞察が必要な場合は、通常モードをご利用ください。*
-"""
+""")
 
-        return report
+        return ''.join(parts)
     
     @staticmethod
     def render_statistics(stats: Dict[str, Any]):
         """統計情報を表示"""
         st.subheader("📊 セッション統計")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Q&A数", stats.get('qa_count', 0))
-        
-        with col2:
-            duration = stats.get('duration_seconds', 0)
-            duration_str = f"{duration:.1f}秒" if duration else "N/A"
-            st.metric("処理時間", duration_str)
-        
-        with col3:
-            st.metric("文書ページ数", stats.get('document_pages', 0))
-        
-        with col4:
-            tokens = stats.get('document_tokens', 0)
-            token_str = f"{tokens:,}" if tokens else "N/A"
-            st.metric("トークン数", token_str)
+
+        # 表示値を先に整形してからまとめて描画
+        duration = stats.get('duration_seconds', 0)
+        tokens = stats.get('document_tokens', 0)
+        metrics = [
+            ("Q&A数", stats.get('qa_count', 0)),
+            ("処理時間", f"{duration:.1f}秒" if duration else "N/A"),
+            ("文書ページ数", stats.get('document_pages', 0)),
+            ("トークン数", f"{tokens:,}" if tokens else "N/A")
+        ]
+
+        UIComponents.render_metrics(metrics)
+
+    @staticmethod
+    def render_metrics(metrics: List[tuple]):
+        """(ラベル, 値) のリストをメトリクスとして表示"""
+        if Settings.COMPACT_METRICS:
+            # 1行の表にまとめて1要素で描画（pandasはこの表示形式を使う場合のみ読み込む）
+            import pandas as pd
+            st.dataframe(
+                pd.DataFrame([{label: str(value) for label, value in metrics}]),
+                hide_index=True,
+                use_container_width=True
+            )
+            return
+
+        for col, (label, value) in zip(st.columns(len(metrics)), metrics):
+            col.metric(label, value)
     
+    @staticmethod
+    def render_message(kind: str, message: str):
+        """種別（error/success/warning/info）に応じたメッセージを表示"""
+        _MESSAGE_RENDERERS[kind](_MESSAGE_PREFIXES[kind] + message)
+
     @staticmethod
     def render_error_message(error: str):
         """エラーメッセージを表示"""
-        st.error(f"❌ エラーが発生しました: {error}")
+        UIComponents.render_message('error', error)
     
     @staticmethod
     def render_success_message(message: str):
         """成功メッセージを表示"""
-        st.success(f"✅ {message}")
+        UIComponents.render_message('success', message)
     
     @staticmethod
     def render_warning_message(message: str):
         """警告メッセージを表示"""
-        st.warning(f"⚠️ {message}")
+        UIComponents.render_message('warning', message)
     
     @staticmethod
     def render_info_message(message: str):
         """情報メッセージを表示"""
-        st.info(f"ℹ️ {message}")
+        UIComponents.render_message('info', message)
     
     @staticmethod
     def render_skeleton_summary():
@@ -1259,42 +1240,15 @@ class UIComponents:
         st.subheader("📋 文書要約")
         with st.container():
             # テキストのスケルトン表示
-            st.markdown("""
-            <div style='background: linear-gradient(90deg, #f0f2f6 25%, #e6e6e6 37%, #f0f2f6 63%); 
-                        background-size: 400% 100%; animation: shimmer 1.5s ease-in-out infinite;
-                        height: 20px; border-radius: 4px; margin: 8px 0;'></div>
-            <div style='background: linear-gradient(90deg, #f0f2f6 25%, #e6e6e6 37%, #f0f2f6 63%); 
-                        background-size: 400% 100%; animation: shimmer 1.5s ease-in-out infinite;
-                        height: 20px; border-radius: 4px; margin: 8px 0; width: 85%;'></div>
-            <div style='background: linear-gradient(90deg, #f0f2f6 25%, #e6e6e6 37%, #f0f2f6 63%); 
-                        background-size: 400% 100%; animation: shimmer 1.5s ease-in-out infinite;
-                        height: 20px; border-radius: 4px; margin: 8px 0; width: 92%;'></div>
-            <style>
-            @keyframes shimmer {
-              0% { background-position: -200% 0; }
-              100% { background-position: 200% 0; }
-            }
-            </style>
-            """, unsafe_allow_html=True)
+            st.markdown(_SKELETON_SUMMARY_HTML, unsafe_allow_html=True)
         st.divider()
     
     @staticmethod
     def render_skeleton_qa():
         """Q&Aセクションのスケルトンローディング"""
         st.subheader("💬 Q&Aセッション")
-        for i in range(3):  # 3つのスケルトンQ&Aを表示
-            with st.expander(f"❓ Q{i+1}: 質問を生成中...", expanded=False):
-                st.markdown("""
-                <div style='background: linear-gradient(90deg, #f0f2f6 25%, #e6e6e6 37%, #f0f2f6 63%); 
-                            background-size: 400% 100%; animation: shimmer 1.5s ease-in-out infinite;
-                            height: 16px; border-radius: 4px; margin: 4px 0; width: 70%;'></div>
-                <div style='background: linear-gradient(90deg, #f0f2f6 25%, #e6e6e6 37%, #f0f2f6 63%); 
-                            background-size: 400% 100%; animation: shimmer 1.5s ease-in-out infinite;
-                            height: 16px; border-radius: 4px; margin: 8px 0;'></div>
-                <div style='background: linear-gradient(90deg, #f0f2f6 25%, #e6e6e6 37%, #f0f2f6 63%); 
-                            background-size: 400% 100%; animation: shimmer 1.5s ease-in-out infinite;
-                            height: 16px; border-radius: 4px; margin: 4px 0; width: 88%;'></div>
-                """, unsafe_allow_html=True)
+        # 3つのスケルトンQ&Aを1回のst.markdownで表示
+        st.markdown(_SKELETON_QA_SECTION_HTML, unsafe_allow_html=True)
 
 class StreamingDisplay:
     """ストリーミング表示用のクラス"""
@@ -1304,8 +1258,14 @@ class StreamingDisplay:
         self.current_qa = {"question": "", "answer": ""}
         self.qa_count = 0
     
+    def reset(self):
+        """新しい文書の処理前に表示状態を初期化"""
+        self.containers.clear()
+        self.current_qa = {"question": "", "answer": ""}
+        self.qa_count = 0
+
     def create_streaming_area(self):
-        """ストリーミング表示エリアを作成"""
+        """ストリーミング表示エリアを作成（要素は再実行ごとに消えるため毎回作り直し、Q&A番号などの状態は保持）"""
         self.main_container = st.container()
         self.progress_placeholder = st.empty()
         
@@ -1330,19 +1290,23 @@ class StreamingDisplay:
         """質問を表示"""
         self.qa_count += 1
         self.current_qa["question"] = question
-        
-        with st.expander(f"❓ Q{self.qa_count}: {question[:50]}...", expanded=True):
-            st.markdown(f"**質問：** {question}")
-            # 回答用のプレースホルダーを作成
-            answer_placeholder = st.empty()
-            self.current_qa["answer_placeholder"] = answer_placeholder
+
+        # エキスパンダーのタイトルは質問ごとに一度だけ生成（50文字を超える場合のみ省略記号を付与）
+        title = f"❓ {UIComponents.format_qa_title(self.qa_count, question)}"
+
+        with st.expander(title, expanded=True):
+            # 本文は1つのプレースホルダーに描画し、回答到着時に質問と回答をまとめて置き換える
+            body_placeholder = st.empty()
+            body_placeholder.markdown(f"**質問：** {question}")
+            self.current_qa["body_placeholder"] = body_placeholder
     
     def _display_answer(self, answer: str):
         """回答を表示"""
-        if "answer_placeholder" in self.current_qa:
-            with self.current_qa["answer_placeholder"]:
-                st.markdown(f"**回答：** {answer}")
-        
+        if "body_placeholder" in self.current_qa:
+            self.current_qa["body_placeholder"].markdown(
+                f"**質問：** {self.current_qa['question']}\n\n**回答：** {answer}"
+            )
+
         # Q&Aペア完了
         self.current_qa = {"question": "", "answer": ""}
     
@@ -1,14 +1,56 @@
 import streamlit as st
 import os
 import configparser
+import io
+import re
 from typing import Dict, Any, List
-from prompts.prompt_loader import PromptLoader
+from prompts.prompt_loader import get_prompt_loader
+
+# エージェント種別のUI表示名
+_AGENT_NAME_MAP = {
+    "student": "🎓 生徒エージェント",
+    "teacher": "👨‍🏫 先生エージェント",
+    "summarizer": "📋 要約エージェント",
+    "initial_summarizer": "📄 初期要約エージェント"
+}
+
+# 既知バージョンの説明
+_VERSION_DESCRIPTIONS = {
+    "v1_0_0": "初期バージョン - 基本的な機能",
+    "v2_0_0": "改良版 - 機能拡張",
+    "v2_1_0": "マイナーアップデート"
+}
+
+# プレビューで箇条書き表示するセクションと見出し（表示順）
+_PREVIEW_LIST_SECTIONS = (
+    ('personality', "性格:"),       # studentの場合
+    ('expertise', "専門性:"),       # teacherの場合
+    ('responsibilities', "責任:"),  # summarizerの場合
+    ('output_format', "出力形式:"),  # summarizerの場合
+    ('instruction', "指示:")
+)
+
+# バージョン名の形式（v1_0_0 形式）
+_VERSION_RE = re.compile(r'^v\d+_\d+_\d+$')
+
+@st.cache_data(show_spinner=False)
+def _load_available_versions(agent_type: str, dir_mtime: float) -> List[str]:
+    """利用可能なバージョンリストを取得（dir_mtimeをキーにし、ディレクトリ更新時のみ再取得）"""
+    try:
+        versions = get_prompt_loader().get_available_versions(agent_type)
+        # v1_0_0を最初に来るようにソート
+        if "v1_0_0" in versions:
+            versions = ["v1_0_0"] + [v for v in versions if v != "v1_0_0"]
+        return versions
+    except Exception:
+        return ["v1_0_0"]  # デフォルト
 
 class PromptEditor:
     """プロンプト編集機能を提供するクラス"""
     
     def __init__(self):
-        self.prompt_loader = PromptLoader()
+        # 共有PromptLoaderを使い、ファイル更新時刻ベースの読み込みキャッシュを再実行間で保持
+        self.prompt_loader = get_prompt_loader()
         self.agent_types = ["student", "teacher", "summarizer", "initial_summarizer"]
     
     def render_prompt_editor_tab(self):
@@ -30,13 +72,7 @@ class PromptEditor:
     
     def _format_agent_name(self, agent_type: str) -> str:
         """エージェント名をUI表示用にフォーマット"""
-        name_map = {
-            "student": "🎓 生徒エージェント",
-            "teacher": "👨‍🏫 先生エージェント", 
-            "summarizer": "📋 要約エージェント",
-            "initial_summarizer": "📄 初期要約エージェント"
-        }
-        return name_map.get(agent_type, agent_type)
+        return _AGENT_NAME_MAP.get(agent_type, agent_type)
     
     def _render_version_management(self, agent_type: str):
         """バージョン管理セクションを描画"""
@@ -92,52 +128,56 @@ class PromptEditor:
             # 現在のプロンプトを読み込み
             prompt_config = self.prompt_loader.load_prompt(agent_type, current_version)
             
-            # セクションごとに編集フィールドを表示
-            updated_config = {}
-            
-            for section_name, section_content in prompt_config.items():
-                with st.expander(f"📁 {section_name.upper()}", expanded=True):
-                    updated_config[section_name] = {}
-                    
-                    for key, value in section_content.items():
-                        # テキストエリアで編集可能に
-                        updated_value = st.text_area(
-                            key,
-                            value=value,
-                            height=100 if len(value) > 50 else 50,
-                            key=f"{agent_type}_{current_version}_{section_name}_{key}"
-                        )
-                        updated_config[section_name][key] = updated_value
-            
-            # 保存ボタン
-            col1, col2, col3 = st.columns([1, 1, 1])
-            
-            with col1:
-                if st.button("💾 現在のバージョンを保存", key=f"{agent_type}_save_current"):
-                    self._save_prompt_config(agent_type, current_version, updated_config)
-                    st.success(f"バージョン '{current_version}' を保存しました")
-            
-            with col2:
-                save_as_version = st.text_input(
-                    "名前を付けて保存",
-                    placeholder="v2_1_0",
-                    key=f"{agent_type}_save_as_name"
-                )
-                
-                if st.button("📋 名前を付けて保存", key=f"{agent_type}_save_as"):
-                    if save_as_version and self._is_valid_version_name(save_as_version):
-                        self._save_prompt_config(agent_type, save_as_version, updated_config)
-                        st.success(f"新バージョン '{save_as_version}' として保存しました")
-                        # バージョンリストを更新
-                        st.session_state[f"{agent_type}_current_version"] = save_as_version
-                        st.rerun()
-                    else:
-                        st.error("有効なバージョン名を入力してください")
-            
-            with col3:
-                if st.button("🔄 リセット", key=f"{agent_type}_reset"):
+            # 編集内容はフォームにまとめ、保存ボタン押下時のみ再実行する
+            with st.form(key=f"{agent_type}_{current_version}_form"):
+                # セクションごとに編集フィールドを表示
+                updated_config = {}
+
+                for section_name, section_content in prompt_config.items():
+                    with st.expander(f"📁 {section_name.upper()}", expanded=True):
+                        updated_config[section_name] = {}
+
+                        for key, value in section_content.items():
+                            # テキストエリアで編集可能に
+                            updated_value = st.text_area(
+                                key,
+                                value=value,
+                                height=100 if len(value) > 50 else 50,
+                                key=f"{agent_type}_{current_version}_{section_name}_{key}"
+                            )
+                            updated_config[section_name][key] = updated_value
+
+                # 保存ボタン
+                col1, col2 = st.columns([1, 1])
+
+                with col1:
+                    save_current = st.form_submit_button("💾 現在のバージョンを保存")
+
+                with col2:
+                    save_as_version = st.text_input(
+                        "名前を付けて保存",
+                        placeholder="v2_1_0",
+                        key=f"{agent_type}_save_as_name"
+                    )
+                    save_as = st.form_submit_button("📋 名前を付けて保存")
+
+            if save_current:
+                self._save_prompt_config(agent_type, current_version, updated_config)
+                st.success(f"バージョン '{current_version}' を保存しました")
+
+            if save_as:
+                if save_as_version and self._is_valid_version_name(save_as_version):
+                    self._save_prompt_config(agent_type, save_as_version, updated_config)
+                    st.success(f"新バージョン '{save_as_version}' として保存しました")
+                    # バージョンリストを更新
+                    st.session_state[f"{agent_type}_current_version"] = save_as_version
                     st.rerun()
-            
+                else:
+                    st.error("有効なバージョン名を入力してください")
+
+            if st.button("🔄 リセット", key=f"{agent_type}_reset"):
+                st.rerun()
+
             # プレビューセクション
             st.subheader(" プレビュー")
             with st.expander("生成されるシステムプロンプト", expanded=False):
@@ -154,30 +194,20 @@ class PromptEditor:
     
     def _get_available_versions(self, agent_type: str) -> List[str]:
         """利用可能なバージョンリストを取得"""
+        # バージョンファイルの追加でディレクトリの更新時刻が変わり、キャッシュが自動的に無効になる
         try:
-            versions = self.prompt_loader.get_available_versions(agent_type)
-            # v1_0_0を最初に来るようにソート
-            if "v1_0_0" in versions:
-                versions = ["v1_0_0"] + [v for v in versions if v != "v1_0_0"]
-            return versions
-        except Exception:
-            return ["v1_0_0"]  # デフォルト
+            dir_mtime = os.path.getmtime(os.path.join("prompts", agent_type))
+        except OSError:
+            dir_mtime = 0.0
+        return _load_available_versions(agent_type, dir_mtime)
     
     def _get_version_info(self, agent_type: str, version: str) -> str:
         """バージョン情報を取得"""
-        version_descriptions = {
-            "v1_0_0": "初期バージョン - 基本的な機能",
-            "v2_0_0": "改良版 - 機能拡張",
-            "v2_1_0": "マイナーアップデート"
-        }
-        return version_descriptions.get(version, f"カスタムバージョン: {version}")
+        return _VERSION_DESCRIPTIONS.get(version, f"カスタムバージョン: {version}")
     
     def _is_valid_version_name(self, version_name: str) -> bool:
         """バージョン名の有効性をチェック"""
-        import re
-        # v1_0_0 形式をチェック
-        pattern = r'^v\d+_\d+_\d+$'
-        return bool(re.match(pattern, version_name))
+        return bool(_VERSION_RE.match(version_name))
     
     def _create_new_version(self, agent_type: str, version_name: str):
         """新しいバージョンを作成"""
@@ -209,8 +239,13 @@ class PromptEditor:
                 for key, value in section_content.items():
                     parser.set(section_name, key, value)
             
-            with open(file_path, 'w', encoding='utf-8') as file:
-                parser.write(file)
+            # メモリ上で書き出してから一時ファイル経由で置き換え（書き込み途中のファイルを残さない）
+            buffer = io.StringIO()
+            parser.write(buffer)
+            tmp_path = file_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                file.write(buffer.getvalue())
+            os.replace(tmp_path, file_path)
                 
         except Exception as e:
             st.error(f"保存エラー: {str(e)}")
@@ -218,39 +253,15 @@ class PromptEditor:
     def _generate_system_prompt_preview(self, config: Dict[str, Dict[str, str]]) -> str:
         """システムプロンプトのプレビューを生成"""
         system_parts = []
-        
+
         # system セクション
         if 'system' in config:
             system_parts.append(f"役割: {config['system'].get('role', '')}")
-        
-        # personality セクション（studentの場合）
-        if 'personality' in config:
-            system_parts.append("性格:")
-            for key, value in config['personality'].items():
-                system_parts.append(f"- {key}: {value}")
-        
-        # expertise セクション（teacherの場合）
-        if 'expertise' in config:
-            system_parts.append("専門性:")
-            for key, value in config['expertise'].items():
-                system_parts.append(f"- {key}: {value}")
-        
-        # responsibilities セクション（summarizerの場合）
-        if 'responsibilities' in config:
-            system_parts.append("責任:")
-            for key, value in config['responsibilities'].items():
-                system_parts.append(f"- {key}: {value}")
-        
-        # output_format セクション（summarizerの場合）
-        if 'output_format' in config:
-            system_parts.append("出力形式:")
-            for key, value in config['output_format'].items():
-                system_parts.append(f"- {key}: {value}")
-        
-        # instruction セクション
-        if 'instruction' in config:
-            system_parts.append("指示:")
-            for key, value in config['instruction'].items():
-                system_parts.append(f"- {key}: {value}")
-        
-        return "\n".join(system_parts)
\ No newline at end of file
+
+        # 箇条書きで表示するセクション（見出し + "- key: value" 行）
+        for section, label in _PREVIEW_LIST_SECTIONS:
+            if section in config:
+                system_parts.append(label)
+                system_parts.extend(f"- {key}: {value}" for key, value in config[section].items())
+
+        return "\n".join(system_parts)
@@ -1,79 +1,57 @@
-import streamlit as st
-
-class StyleManager:
-    """アプリケーションのスタイルを管理するクラス"""
-
-    @staticmethod
-    def apply_custom_styles():
-        """カスタムCSSスタイルを適用（ダークモード完全対応版）"""
-        st.markdown("""
-        <style>
-        /* CSS変数でテーマカラーを定義 - ライトモード */
-        :root {
-            --bg-primary: #ffffff;
-            --bg-secondary: #f8f9fa;
-            --bg-tertiary: #e9ecef;
-            --text-primary: #333333;
-            --text-secondary: #666666;
-            --text-inverse: #ffffff;
-            --border-color: #dee2e6;
-            --border-light: #e9ecef;
-            --shadow-sm: rgba(0, 0, 0, 0.05);
-            --shadow-md: rgba(0, 0, 0, 0.1);
-            --shadow-lg: rgba(0, 0, 0, 0.15);
-            --qa-section-bg: #f8f9fa;
-            --question-bg: #e3f2fd;
-            --question-border: #2196f3;
-            --answer-bg: #f3e5f5;
-            --answer-border: #9c27b0;
-            --code-bg: #f8f9fa;
-            --code-border: #e9ecef;
-            --metric-bg: #ffffff;
-            --tab-bg: #ffffff;
-            --tab-hover-bg: #f8f9fa;
-            --tab-active-bg: linear-gradient(135deg, #007bff 0%, #0056b3 100%);
-            --subtab-bg: #ffffff;
-            --subtab-hover-bg: #f8f9fa;
-            --subtab-active-bg: linear-gradient(135deg, #1a73e8 0%, #1557b0 100%);
-            --gradient-primary: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-            --gradient-button: linear-gradient(45deg, #007bff, #0056b3);
-            --gradient-progress: linear-gradient(90deg, #007bff, #28a745);
-        }
-
-        /* ダークモード用CSS変数 */
-        @media (prefers-color-scheme: dark) {
-            :root {
-                --bg-primary: #0e1117;
-                --bg-secondary: #262730;
-                --bg-tertiary: #1e1e1e;
-                --text-primary: #fafafa;
-                --text-secondary: #b0b0b0;
-                --text-inverse: #ffffff;
-                --border-color: #4a5568;
-                --border-light: #2d3748;
-                --shadow-sm: rgba(0, 0, 0, 0.3);
-                --shadow-md: rgba(0, 0, 0, 0.4);
-                --shadow-lg: rgba(0, 0, 0, 0.5);
-                --qa-section-bg: #2d3748;
-                --question-bg: #2a4365;
-                --question-border: #4299e1;
-                --answer-bg: #44337a;
-                --answer-border: #b794f4;
-                --code-bg: #1a202c;
-                --code-border: #2d3748;
-                --metric-bg: #262730;
-                --tab-bg: #262730;
-                --tab-hover-bg: #2d3748;
-                --tab-active-bg: linear-gradient(135deg, #4299e1 0%, #3182ce 100%);
-                --subtab-bg: #1e1e1e;
-                --subtab-hover-bg: #2d3748;
-                --subtab-active-bg: linear-gradient(135deg, #4299e1 0%, #3182ce 100%);
-                --gradient-primary: linear-gradient(90deg, #4c51bf 0%, #6b46c1 100%);
-                --gradient-button: linear-gradient(45deg, #4299e1, #3182ce);
-                --gradient-progress: linear-gradient(90deg, #4299e1, #48bb78);
-            }
-        }
-
+import html
+import re
+from typing import List, Tuple
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_SPACE_RE = re.compile(r'\s*([{};:,>])\s*')
+
+def _minify_css(css: str) -> str:
+    """CSSのコメントと余分な空白を除去（送信サイズとブラウザのパース量を削減）"""
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = _CSS_SPACE_RE.sub(' ', css)
+    return _CSS_PUNCT_SPACE_RE.sub(r'\1', css).strip()
+
+# テーマカラーのCSS変数（変数名: (ライトモード, ダークモード)）
+_THEME_VARIABLES = {
+    "bg-primary": ("#ffffff", "#0e1117"),
+    "bg-secondary": ("#f8f9fa", "#262730"),
+    "bg-tertiary": ("#e9ecef", "#1e1e1e"),
+    "text-primary": ("#333333", "#fafafa"),
+    "text-secondary": ("#666666", "#b0b0b0"),
+    "text-inverse": ("#ffffff", "#ffffff"),
+    "border-color": ("#dee2e6", "#4a5568"),
+    "border-light": ("#e9ecef", "#2d3748"),
+    "shadow-sm": ("rgba(0, 0, 0, 0.05)", "rgba(0, 0, 0, 0.3)"),
+    "shadow-md": ("rgba(0, 0, 0, 0.1)", "rgba(0, 0, 0, 0.4)"),
+    "shadow-lg": ("rgba(0, 0, 0, 0.15)", "rgba(0, 0, 0, 0.5)"),
+    "qa-section-bg": ("#f8f9fa", "#2d3748"),
+    "question-bg": ("#e3f2fd", "#2a4365"),
+    "question-border": ("#2196f3", "#4299e1"),
+    "answer-bg": ("#f3e5f5", "#44337a"),
+    "answer-border": ("#9c27b0", "#b794f4"),
+    "code-bg": ("#f8f9fa", "#1a202c"),
+    "code-border": ("#e9ecef", "#2d3748"),
+    "metric-bg": ("#ffffff", "#262730"),
+    "tab-bg": ("#ffffff", "#262730"),
+    "tab-hover-bg": ("#f8f9fa", "#2d3748"),
+    "tab-active-bg": ("linear-gradient(135deg, #007bff 0%, #0056b3 100%)", "linear-gradient(135deg, #4299e1 0%, #3182ce 100%)"),
+    "subtab-bg": ("#ffffff", "#1e1e1e"),
+    "subtab-hover-bg": ("#f8f9fa", "#2d3748"),
+    "subtab-active-bg": ("linear-gradient(135deg, #1a73e8 0%, #1557b0 100%)", "linear-gradient(135deg, #4299e1 0%, #3182ce 100%)"),
+    "gradient-primary": ("linear-gradient(90deg, #667eea 0%, #764ba2 100%)", "linear-gradient(90deg, #4c51bf 0%, #6b46c1 100%)"),
+    "gradient-button": ("linear-gradient(45deg, #007bff, #0056b3)", "linear-gradient(45deg, #4299e1, #3182ce)"),
+    "gradient-progress": ("linear-gradient(90deg, #007bff, #28a745)", "linear-gradient(90deg, #4299e1, #48bb78)")
+}
+
+def _build_theme_css() -> str:
+    """テーマ変数の定義から、ライトモードとダークモード用の:rootブロックを生成"""
+    light = "".join(f"--{name}: {light};" for name, (light, _) in _THEME_VARIABLES.items())
+    dark = "".join(f"--{name}: {dark};" for name, (_, dark) in _THEME_VARIABLES.items())
+    return f":root {{{light}}} @media (prefers-color-scheme: dark) {{ :root {{{dark}}} }}"
+
+# カスタムCSS（ダークモード完全対応版、インポート時に一度だけ最小化）
+_CUSTOM_CSS = _minify_css("<style>" + _build_theme_css() + """
         /* メインコンテナのスタイル */
         .main {
             padding-top: 2rem;
@@ -159,18 +137,26 @@ class StyleManager:
             margin: 0.5rem 0;
         }
 
+        /* メトリックカードのグリッド（列数は --cols で指定） */
+        .metric-grid {
+            display: grid;
+            grid-template-columns: repeat(var(--cols, 4), 1fr);
+            gap: 0.5rem;
+        }
+
+        /* 未入力時のアプリ説明の段組み */
+        .help-grid {
+            display: grid;
+            grid-template-columns: repeat(var(--cols, 2), 1fr);
+            gap: 1rem;
+        }
+
         /* プログレスバーのスタイル */
         .stProgress .st-bo {
             background: var(--gradient-progress);
         }
 
-        /* サイドバーのスタイル */
-        .css-1d391kg {
-            background-color: var(--bg-secondary);
-        }
-        
         /* メインタブのスタイル - レベル1（最上位） */
-        .stTabs[data-tabs-level="0"] [data-baseweb="tab-list"],
         .stTabs:not(.stTabs .stTabs) [data-baseweb="tab-list"] {
             gap: 16px;
             background: var(--bg-secondary);
@@ -180,7 +166,6 @@ class StyleManager:
             border: 2px solid var(--border-color);
         }
 
-        .stTabs[data-tabs-level="0"] [data-baseweb="tab"],
         .stTabs:not(.stTabs .stTabs) [data-baseweb="tab"] {
             height: 56px;
             padding: 0 32px;
@@ -197,7 +182,6 @@ class StyleManager:
             box-shadow: 0 2px 8px var(--shadow-sm);
         }
 
-        .stTabs[data-tabs-level="0"] [data-baseweb="tab"]:hover,
         .stTabs:not(.stTabs .stTabs) [data-baseweb="tab"]:hover {
             background: var(--tab-hover-bg);
             transform: translateY(-3px);
@@ -205,7 +189,6 @@ class StyleManager:
             border-color: var(--text-secondary);
         }
 
-        .stTabs[data-tabs-level="0"] [aria-selected="true"],
         .stTabs:not(.stTabs .stTabs) [aria-selected="true"] {
             background: var(--tab-active-bg);
             color: var(--text-inverse);
@@ -214,14 +197,12 @@ class StyleManager:
             box-shadow: 0 12px 32px var(--shadow-lg);
         }
 
-        .stTabs[data-tabs-level="0"] [aria-selected="true"]:hover,
         .stTabs:not(.stTabs .stTabs) [aria-selected="true"]:hover {
             transform: translateY(-4px);
             box-shadow: 0 16px 40px var(--shadow-lg);
         }
 
         /* メインタブコンテンツエリア */
-        .stTabs[data-tabs-level="0"] [data-baseweb="tab-panel"],
         .stTabs:not(.stTabs .stTabs) [data-baseweb="tab-panel"] {
             padding: 32px;
             background: var(--bg-primary);
@@ -370,6 +351,11 @@ class StyleManager:
             .metric-card {
                 margin: 0.25rem 0;
             }
+
+            .metric-grid,
+            .help-grid {
+                grid-template-columns: 1fr;
+            }
         }
         
         /* アニメーション */
@@ -388,6 +374,26 @@ class StyleManager:
             animation: fadeIn 0.5s ease-out;
         }
         
+        /* スケルトンローディング */
+        @keyframes shimmer {
+            0% { background-position: -200% 0; }
+            100% { background-position: 200% 0; }
+        }
+        
+        .shimmer {
+            background: linear-gradient(90deg, #f0f2f6 25%, #e6e6e6 37%, #f0f2f6 63%);
+            background-size: 400% 100%;
+            animation: shimmer 1.5s ease-in-out infinite;
+            height: 20px;
+            border-radius: 4px;
+            margin: 8px 0;
+        }
+        
+        .shimmer-sm {
+            height: 16px;
+            margin: 4px 0;
+        }
+        
         /* ホバーエフェクト */
         .metric-card:hover {
             transform: translateY(-2px);
@@ -416,54 +422,135 @@ class StyleManager:
             margin-right: 0.5rem;
         }
         </style>
-        """, unsafe_allow_html=True)
+        """)
+
+# 設定確定後の実行開始（primary）・リセット（secondary）ボタンのスタイル
+_ACTION_BUTTON_CSS = _minify_css("""
+        <style>
+        /* 実行開始ボタン（primary）のスタイル */
+        div[data-testid="stButton"] > button[kind="primary"] {
+            background: linear-gradient(135deg, #ff6b6b 0%, #ee5a52 50%, #ff4757 100%) !important;
+            border: 1px solid #ff4757 !important;
+            border-radius: 12px !important;
+            color: white !important;
+            font-weight: 600 !important;
+            backdrop-filter: blur(10px) !important;
+            -webkit-backdrop-filter: blur(10px) !important;
+            box-shadow:
+                0 4px 15px rgba(255, 75, 87, 0.3),
+                inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
+            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+        }
+
+        div[data-testid="stButton"] > button[kind="primary"]:hover {
+            background: linear-gradient(135deg, #ff7675 0%, #fd79a8 50%, #e84393 100%) !important;
+            transform: translateY(-2px) !important;
+            box-shadow:
+                0 6px 20px rgba(255, 75, 87, 0.4),
+                inset 0 1px 0 rgba(255, 255, 255, 0.3) !important;
+        }
+
+        /* リセットボタン（secondary）のスタイル */
+        div[data-testid="stButton"] > button[kind="secondary"] {
+            background: linear-gradient(135deg, rgba(173, 216, 230, 0.4) 0%, rgba(135, 206, 235, 0.5) 50%, rgba(176, 224, 230, 0.4) 100%) !important;
+            border: 1px solid rgba(173, 216, 230, 0.6) !important;
+            border-radius: 12px !important;
+            color: #2c5aa0 !important;
+            font-weight: 500 !important;
+            backdrop-filter: blur(10px) !important;
+            -webkit-backdrop-filter: blur(10px) !important;
+            box-shadow:
+                0 2px 8px rgba(173, 216, 230, 0.3),
+                inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
+            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+        }
+
+        div[data-testid="stButton"] > button[kind="secondary"]:hover {
+            background: linear-gradient(135deg, rgba(173, 216, 230, 0.6) 0%, rgba(135, 206, 235, 0.7) 50%, rgba(176, 224, 230, 0.6) 100%) !important;
+            transform: translateY(-2px) !important;
+            box-shadow:
+                0 4px 16px rgba(173, 216, 230, 0.4),
+                inset 0 1px 0 rgba(255, 255, 255, 0.3) !important;
+        }
+        </style>
+        """)
+
+# コンポーネント種別ごとのCSSクラス
+_COMPONENT_CLASSES = {
+    "question": "question-block",
+    "answer": "answer-block",
+    "qa_section": "qa-section",
+    "metric": "metric-card",
+    "success": "icon-success",
+    "error": "icon-error",
+    "warning": "icon-warning",
+    "info": "icon-info"
+}
+
+def _wrap_component(content: str, component_type: str) -> str:
+    """コンテンツを種別に応じたクラスのdivで囲む"""
+    css_class = _COMPONENT_CLASSES.get(component_type, "fade-in")
+    return f'<div class="{css_class}">{content}</div>'
+
+# スタイル付きQ&Aペアのテンプレート
+_QA_TEMPLATE = (
+    '<div class="qa-section fade-in">'
+    '<div class="question-block"><strong>Q{n}:</strong> {q}</div>'
+    '<div class="answer-block"><strong>A{n}:</strong> {a}</div>'
+    '</div>'
+)
+
+def _render_qa_pair_html(question: str, answer: str, pair_number: int) -> str:
+    """Q&AペアをエスケープしてHTML化"""
+    return _QA_TEMPLATE.format(n=pair_number, q=html.escape(question), a=html.escape(answer))
+
+class StyleManager:
+    """アプリケーションのスタイルを管理するクラス"""
+
+    @staticmethod
+    def apply_custom_styles():
+        """カスタムCSSスタイルを適用（ダークモード完全対応版）"""
+        import streamlit as st
+        st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
+    
+    @staticmethod
+    def apply_action_button_styles():
+        """実行開始・リセットボタンのグラデーションスタイルを適用（設定確定後の画面でのみ使用）"""
+        import streamlit as st
+        st.markdown(_ACTION_BUTTON_CSS, unsafe_allow_html=True)
     
     @staticmethod
     def create_custom_component(content: str, component_type: str = "default") -> str:
         """カスタムHTMLコンポーネントを作成"""
-        component_classes = {
-            "question": "question-block",
-            "answer": "answer-block", 
-            "qa_section": "qa-section",
-            "metric": "metric-card",
-            "success": "icon-success",
-            "error": "icon-error",
-            "warning": "icon-warning",
-            "info": "icon-info"
-        }
-        
-        css_class = component_classes.get(component_type, "fade-in")
-        
-        return f'<div class="{css_class}">{content}</div>'
+        return _wrap_component(content, component_type)
     
     @staticmethod
     def render_custom_metrics(metrics: dict, columns: int = 4):
-        """カスタムメトリックカードを描画"""
-        cols = st.columns(columns)
-        
-        for i, (label, value) in enumerate(metrics.items()):
-            with cols[i % columns]:
-                st.markdown(
-                    StyleManager.create_custom_component(
-                        f"<h4>{label}</h4><h2>{value}</h2>",
-                        "metric"
-                    ),
-                    unsafe_allow_html=True
-                )
+        """カスタムメトリックカードを描画（CSSグリッドで全カードを1回のst.markdownにまとめる）"""
+        cards = "".join(
+            StyleManager.create_custom_component(
+                f"<h4>{html.escape(str(label))}</h4><h2>{html.escape(str(value))}</h2>",
+                "metric"
+            )
+            for label, value in metrics.items()
+        )
+        import streamlit as st
+        st.markdown(
+            f'<div class="metric-grid" style="--cols: {columns};">{cards}</div>',
+            unsafe_allow_html=True
+        )
     
     @staticmethod
     def render_qa_with_style(question: str, answer: str, pair_number: int):
         """スタイル付きQ&Aペアを描画"""
-        # Q&Aセクション全体
-        qa_content = f"""
-        <div class="qa-section fade-in">
-            <div class="question-block">
-                <strong>Q{pair_number}:</strong> {question}
-            </div>
-            <div class="answer-block">
-                <strong>A{pair_number}:</strong> {answer}
-            </div>
-        </div>
-        """
-        
+        StyleManager.render_qa_batch([(question, answer)], start=pair_number)
+
+    @staticmethod
+    def render_qa_batch(pairs: List[Tuple[str, str]], start: int = 1):
+        """スタイル付きQ&Aペアをまとめて1回のst.markdownで描画"""
+        qa_content = "".join(
+            _render_qa_pair_html(question, answer, n)
+            for n, (question, answer) in enumerate(pairs, start)
+        )
+        import streamlit as st
         st.markdown(qa_content, unsafe_allow_html=True)
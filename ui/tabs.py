@@ -1,6 +1,69 @@
 import streamlit as st
+import asyncio
+import base64
+import re
+from collections import deque
+from datetime import datetime
 from typing import Dict, Any, Optional, List
+from agents.teacher_agent import TeacherAgent
+from services.kernel_service import KernelService, AgentOrchestrator
+from services.session_manager import SessionManager
 from ui.components import UIComponents, StreamingDisplay
+from ui.styles import StyleManager
+
+# セッション状態に保持する追加質問履歴の上限（古いものから破棄）
+_MAX_INTERACTIVE_QUESTIONS = 50
+
+# 処理中画面に表示するステップごとの説明
+_STEP_DESCRIPTIONS = {
+    "pdf_processing": "📄 PDFファイルを処理中...",
+    "summary_generation": "📋 文書要約を生成中...",
+    "qa_session": "💬 Q&Aセッションを実行中...",
+    "final_report": "📊 最終レポートを作成中..."
+}
+
+# 未入力時に表示するアプリ説明（静的なため1要素にまとめる。段組みはCSSグリッド）
+_UPLOAD_HELP_HTML = (
+    '<h3>✨ このアプリの特徴</h3>'
+    '<div class="help-grid" style="--cols: 2;">'
+    '<div><p><strong>🤖 3つのAIエージェント</strong></p><ul>'
+    '<li>🎓 <strong>学生エージェント</strong>: 文書について質問を生成</li>'
+    '<li>👨‍🏫 <strong>教師エージェント</strong>: 詳細で分かりやすい回答を提供</li>'
+    '<li>📋 <strong>要約エージェント</strong>: 文書要約と最終レポート作成</li>'
+    '</ul></div>'
+    '<div><p><strong>📊  主要機能</strong></p><ul>'
+    '<li>💡 <strong>理解促進</strong>: Q&amp;A形式で段階的に理解</li>'
+    '<li>🔄 <strong>フォローアップ</strong>: 難しい回答には追加説明</li>'
+    '<li>📝 <strong>レポート</strong>: 学習内容をMarkdown形式で整理</li>'
+    '</ul></div>'
+    '</div>'
+    '<hr>'
+    '<h3>🚀 使用方法</h3>'
+    '<div class="help-grid" style="--cols: 3;">'
+    '<div>'
+    '<p><strong>ステップ1: 設定確認</strong>\n左サイドバーで設定を確認・調整</p>'
+    '<p><strong>ステップ2: ファイル選択</strong>\nPDFファイルをドラッグ&amp;ドロップ, またはテキスト入力</p>'
+    '<p><strong>ステップ3: 実行開始</strong>\n🚀ボタンでQ&amp;Aセッション開始</p>'
+    '</div>'
+    '<div><p><strong>📋 対応ファイル</strong></p><ul>'
+    '<li><strong>形式</strong>: PDFファイル（.pdf）, テキスト入力</li>'
+    '<li><strong>サイズ</strong>: 最大50MB</li>'
+    '<li><strong>内容</strong>: 論文、レポート、マニュアル等の文書</li>'
+    '</ul></div>'
+    '<div><p><strong>⚙️ 設定項目</strong></p><ul>'
+    '<li><strong>Q&amp;A数</strong>: 1-20回（推奨: 10回）</li>'
+    '<li><strong>フォローアップ質問</strong>: 有効/無効</li>'
+    '<li><strong>重要単語</strong>: 優先的に質問生成する単語指定</li>'
+    '</ul></div>'
+    '</div>'
+    '<hr>'
+    '<h3>⚠️ ご利用上の注意</h3>'
+    '<ul>'
+    '<li>処理時間は文書の長さとQ&amp;A数に比例します（目安: 10Q&amp;Aで3-5分）</li>'
+    '<li>専門的な内容ほど、より詳細な説明が生成されます</li>'
+    '<li>生成されるQ&amp;Aは学習効果を重視した構成になっています</li>'
+    '</ul>'
+)
 
 class TabManager:
     """タブ切り替えロジックを管理するクラス"""
@@ -35,6 +98,9 @@ class TabManager:
         qa_pairs = session_data.get('qa_pairs', [])
         
         if qa_pairs:
+            # セッション完了後はストリーミング表示の状態を破棄
+            st.session_state.pop('streaming_display', None)
+
             st.subheader("💬 Q&Aセッション結果")
             self._render_qa_pairs(qa_pairs)
 
@@ -45,10 +111,11 @@ class TabManager:
             processing = session_data.get('processing', False)
             if processing:
                 st.info("🔄 Q&Aセッションを実行中です...")
-                # ストリーミング表示エリアを作成
-                if not self.streaming_display:
-                    self.streaming_display = StreamingDisplay()
-                    self.streaming_display.create_streaming_area()
+                # ストリーミング表示はセッション状態に保持し、再実行をまたいでQ&A番号などを引き継ぐ
+                if 'streaming_display' not in st.session_state:
+                    st.session_state.streaming_display = StreamingDisplay()
+                self.streaming_display = st.session_state.streaming_display
+                self.streaming_display.create_streaming_area()
             else:
                 st.info("📝 PDFファイルをアップロードしてQ&Aセッションを開始してください。")
     
@@ -104,50 +171,11 @@ class TabManager:
     
     def _render_qa_pairs(self, qa_pairs: List[Dict[str, Any]]):
         """Q&Aペアのリストを表示"""
-        for i, qa_pair in enumerate(qa_pairs, 1):
-            question = qa_pair.get('question', '質問なし')
-            answer = qa_pair.get('answer', '回答なし')
-            timestamp = qa_pair.get('timestamp', '')
-            
-            # フォローアップがある場合はタイトルに含める
-            expander_title = f"Q{i}: {question[:50]}..."
-            if qa_pair.get('followup_question'):
-                expander_title = f"Q{i}: {question[:30]}... (+フォローアップ)"
-
-            with st.expander(expander_title, expanded=False):
-                st.markdown(f"**❓ Q{i} (メイン質問):**")
-                st.write(f"{question}")
-
-                st.markdown(f"**💡 A{i}:**")
-                st.write(f"{answer}")
-
-                # フォローアップ質問を関連性を明確にして表示
-                followup_question = qa_pair.get('followup_question', '')
-                followup_answer = qa_pair.get('followup_answer', '')
-
-                if followup_question:
-                    st.markdown("---")  # 区切り線
-
-                    st.markdown(f"**🔄 Q{i}-1 (フォローアップ):**")
-                    st.write(followup_question)
-
-                    st.markdown(f"**💡 A{i}-1:**")
-                    st.write(followup_answer)
-                
-                # キャプション情報（タイムスタンプと専門性スコア）
-                caption_parts = []
-                if timestamp:
-                    caption_parts.append(f"生成時刻: {timestamp}")
-                
-                complexity_score = qa_pair.get('complexity_score', 'N/A')
-                if complexity_score != 'N/A':
-                    caption_parts.append(f"専門性: {complexity_score}")
-                
-                if caption_parts:
-                    st.caption(" | ".join(caption_parts))
+        self.components.render_qa_history(qa_pairs)
 
+    @st.fragment
     def _render_interactive_question_section(self, session_data: Dict[str, Any]):
-        """インタラクティブ質問セクションを描画"""
+        """インタラクティブ質問セクションを描画（フラグメント化し、質問送信時はこのセクションのみ再実行）"""
         st.divider()
         st.subheader("💭 追加で質問する")
 
@@ -164,18 +192,16 @@ class TabManager:
                 submit_button = st.form_submit_button("質問する", use_container_width=True)
 
             if submit_button and user_question.strip():
-                # セッション状態に質問を保存
-                if 'interactive_questions' not in st.session_state:
-                    st.session_state.interactive_questions = []
-
                 # 教師エージェントに質問を送信
                 self._process_interactive_question(user_question, session_data)
 
-        # 過去の質問・回答履歴を表示
-        if 'interactive_questions' in st.session_state and st.session_state.interactive_questions:
+        # 過去の質問・回答履歴を表示（新しい順、番号は古い順に1から）
+        interactive_questions = st.session_state.get('interactive_questions')
+        if interactive_questions:
             st.subheader("🗣️ 質問履歴")
-            for i, qa in enumerate(reversed(st.session_state.interactive_questions), 1):
-                with st.expander(f"追加質問 {len(st.session_state.interactive_questions) - i + 1}: {qa['question'][:50]}...", expanded=i == 1):
+            count = len(interactive_questions)
+            for number, qa in zip(range(count, 0, -1), reversed(interactive_questions)):
+                with st.expander(f"追加質問 {number}: {qa['question'][:50]}...", expanded=number == count):
                     st.markdown(f"**質問：** {qa['question']}")
                     st.markdown(f"**回答：** {qa['answer']}")
                     if qa.get('timestamp'):
@@ -183,22 +209,10 @@ class TabManager:
 
     def _process_interactive_question(self, question: str, session_data: Dict[str, Any]):
         """インタラクティブ質問を処理"""
-        from agents.teacher_agent import TeacherAgent
-        from services.kernel_service import KernelService, AgentOrchestrator
-        from services.session_manager import SessionManager
-        import asyncio
-        from datetime import datetime
-
         try:
             with st.spinner("💭 回答を生成中..."):
-                # カーネルサービスを初期化
-                kernel_service = KernelService()
-
-                # エージェントオーケストレーターを初期化
-                orchestrator = AgentOrchestrator(kernel_service)
-
-                # 教師エージェントを初期化
-                teacher_agent = TeacherAgent(kernel_service)
+                # オーケストレーターと教師エージェントはセッション内で使い回す
+                orchestrator, teacher_agent = self._get_interactive_services()
 
                 # 文書内容を設定
                 document_data = SessionManager.get_document_data()
@@ -231,20 +245,31 @@ class TabManager:
                     'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 }
 
-                # セッション状態に保存
+                # セッション状態に保存（上限付き）
                 if 'interactive_questions' not in st.session_state:
-                    st.session_state.interactive_questions = []
+                    st.session_state.interactive_questions = deque(maxlen=_MAX_INTERACTIVE_QUESTIONS)
                 st.session_state.interactive_questions.append(qa_entry)
 
                 # 教師エージェントの履歴にも追加
                 teacher_agent.add_qa_to_history(question, answer)
 
                 st.success("✅ 回答完了！下の履歴をご確認ください。")
-                st.rerun()
+                # 要約・Q&A一覧は再描画せず、質問セクションのみ更新
+                st.rerun(scope="fragment")
 
         except Exception as e:
             st.error(f"❌ 回答生成エラー: {str(e)}")
 
+    @staticmethod
+    def _get_interactive_services():
+        """追加質問用のオーケストレーターと教師エージェントを取得（初回のみ生成しセッションに保持）"""
+        services = st.session_state.get('_interactive_services')
+        if services is None:
+            kernel_service = KernelService()
+            services = (AgentOrchestrator(kernel_service), TeacherAgent(kernel_service))
+            st.session_state['_interactive_services'] = services
+        return services
+
     def get_streaming_display(self) -> Optional[StreamingDisplay]:
         """ストリーミング表示オブジェクトを取得"""
         return self.streaming_display
@@ -256,9 +281,6 @@ class TabManager:
 
     def _render_document_viewer_tab(self, session_data: Dict[str, Any]):
         """文書ビューアータブの内容"""
-        from services.session_manager import SessionManager
-        import base64
-
         # 文書データを取得
         document_data = SessionManager.get_document_data()
 
@@ -267,114 +289,119 @@ class TabManager:
             return
 
         # 文書データから必要な情報を取得
-        if document_data:
-            input_type = document_data.get('input_type', 'unknown')
-            text_content = document_data.get('text_content', '')
-            raw_content = document_data.get('raw_content')
-
-            # デバッグ情報を表示
-            with st.expander("🔍 デバッグ情報", expanded=False):
-                st.write(f"**入力タイプ:** {input_type}")
-                st.write(f"**テキスト内容:** {'あり' if text_content else 'なし'}")
-                st.write(f"**生データ:** {'あり' if raw_content else 'なし'}")
-                st.write(f"**生データタイプ:** {type(raw_content) if raw_content else 'None'}")
-                if raw_content and isinstance(raw_content, bytes):
-                    st.write(f"**生データサイズ:** {len(raw_content)} bytes")
-
-            # PDFビューアー表示（PDFの場合）
-            if input_type == 'pdf' and document_data.get('raw_content'):
-                st.markdown("**📄 PDFビューアー**")
-
-                try:
-                    # PDFの生データをBase64エンコード
-                    pdf_data = document_data.get('raw_content')
-                    if isinstance(pdf_data, bytes):
-                        b64_pdf = base64.b64encode(pdf_data).decode()
-                    else:
-                        # 既にBase64エンコードされている場合
-                        b64_pdf = pdf_data
-
-                    # PDFビューアーのHTML
-                    pdf_display = f"""
-                    <div style="width: 100%; height: 600px; border: 1px solid #ddd; border-radius: 5px;">
-                        <iframe
-                            src="data:application/pdf;base64,{b64_pdf}"
-                            width="100%"
-                            height="100%"
-                            type="application/pdf"
-                            style="border: none;">
-                            <p>PDFを表示できません。ブラウザがPDF表示をサポートしていない可能性があります。</p>
-                        </iframe>
-                    </div>
-                    """
-
-                    st.markdown(pdf_display, unsafe_allow_html=True)
-
-                except Exception as e:
-                    st.error(f"PDFの表示でエラーが発生しました: {str(e)}")
-                    # エラー時はテキスト表示にフォールバック
-                    st.markdown("**📖 抽出されたテキスト**")
-                    if text_content:
-                        st.text_area(
-                            "抽出されたテキスト:",
-                            value=text_content,
-                            height=400,
-                            disabled=True,
-                            key="pdf_text_fallback"
-                        )
-                    else:
-                        st.warning("⚠️ 文書内容が取得できませんでした。")
+        input_type = document_data.get('input_type', 'unknown')
+        text_content = document_data.get('text_content', '')
+        raw_content = document_data.get('raw_content')
+
+        # デバッグ情報を表示
+        with st.expander("🔍 デバッグ情報", expanded=False):
+            st.write(f"**入力タイプ:** {input_type}")
+            st.write(f"**テキスト内容:** {'あり' if text_content else 'なし'}")
+            st.write(f"**生データ:** {'あり' if raw_content else 'なし'}")
+            st.write(f"**生データタイプ:** {type(raw_content) if raw_content else 'None'}")
+            if raw_content and isinstance(raw_content, bytes):
+                st.write(f"**生データサイズ:** {len(raw_content)} bytes")
+
+        # PDFビューアー表示（PDFの場合）
+        if input_type == 'pdf' and document_data.get('raw_content'):
+            st.markdown("**📄 PDFビューアー**")
+
+            try:
+                # PDFの生データをBase64エンコード（同じPDFは再実行ごとにエンコードし直さない）
+                pdf_data = document_data.get('raw_content')
+                if isinstance(pdf_data, bytes):
+                    b64_pdf = self._get_pdf_base64(pdf_data)
+                else:
+                    # 既にBase64エンコードされている場合
+                    b64_pdf = pdf_data
+
+                # PDFビューアーのHTML
+                pdf_display = f"""
+                <div style="width: 100%; height: 600px; border: 1px solid #ddd; border-radius: 5px;">
+                    <iframe
+                        src="data:application/pdf;base64,{b64_pdf}"
+                        width="100%"
+                        height="100%"
+                        type="application/pdf"
+                        style="border: none;">
+                        <p>PDFを表示できません。ブラウザがPDF表示をサポートしていない可能性があります。</p>
+                    </iframe>
+                </div>
+                """
+
+                st.markdown(pdf_display, unsafe_allow_html=True)
+
+            except Exception as e:
+                st.error(f"PDFの表示でエラーが発生しました: {str(e)}")
+                # エラー時はテキスト表示にフォールバック
+                st.markdown("**📖 抽出されたテキスト**")
+                if text_content:
+                    st.text_area(
+                        "抽出されたテキスト:",
+                        value=text_content,
+                        height=400,
+                        disabled=True,
+                        key="pdf_text_fallback"
+                    )
+                else:
+                    st.warning("⚠️ 文書内容が取得できませんでした。")
 
-            # テキスト表示（テキスト入力の場合のみ）
-            elif input_type == 'text':
-                st.markdown("**📖 文書内容（テキスト表示）**")
+        # テキスト表示（テキスト入力の場合のみ）
+        elif input_type == 'text':
+            st.markdown("**📖 文書内容（テキスト表示）**")
 
-                # 検索機能
-                search_term = st.text_input(
-                    "🔍 文書内検索",
-                    placeholder="キーワードを入力して文書内を検索...",
-                    key="document_search"
-                )
+            # 検索機能
+            search_term = st.text_input(
+                "🔍 文書内検索",
+                placeholder="キーワードを入力して文書内を検索...",
+                key="document_search"
+            )
 
-                # テキスト入力の場合：検索機能付きシンプル表示
-                if text_content:
-                    if search_term:
-                        # 検索結果の表示
-                        if search_term.lower() in text_content.lower():
-                            match_count = text_content.lower().count(search_term.lower())
-                            st.success(f"🔍 「{search_term}」が{match_count}箇所で見つかりました")
-
-                            # 検索ワードをハイライト
-                            import re
-                            highlighted_content = re.sub(
-                                f'({re.escape(search_term)})',
-                                r'<mark style="background-color: #ffeb3b;">\1</mark>',
-                                text_content,
-                                flags=re.IGNORECASE
-                            )
-                            st.markdown(highlighted_content, unsafe_allow_html=True)
-                        else:
-                            st.warning(f"「{search_term}」は文書内に見つかりませんでした")
-                            st.text_area(
-                                "入力されたテキスト:",
-                                value=text_content,
-                                height=400,
-                                disabled=True,
-                                key="text_content_display_no_match"
-                            )
+            # テキスト入力の場合：検索機能付きシンプル表示
+            if text_content:
+                if search_term:
+                    # 検索ワードのハイライトと件数の集計を1回の走査で行う
+                    highlighted_content, match_count = re.subn(
+                        re.escape(search_term),
+                        r'<mark style="background-color: #ffeb3b;">\g<0></mark>',
+                        text_content,
+                        flags=re.IGNORECASE
+                    )
+
+                    # 検索結果の表示
+                    if match_count:
+                        st.success(f"🔍 「{search_term}」が{match_count}箇所で見つかりました")
+                        st.markdown(highlighted_content, unsafe_allow_html=True)
                     else:
-                        # 検索なしの場合は通常表示
+                        st.warning(f"「{search_term}」は文書内に見つかりませんでした")
                         st.text_area(
                             "入力されたテキスト:",
                             value=text_content,
                             height=400,
                             disabled=True,
-                            key="text_content_display"
+                            key="text_content_display_no_match"
                         )
                 else:
-                    st.warning("⚠️ 文書内容が取得できませんでした。")
-        else:
-            st.warning("⚠️ 文書データが見つかりませんでした。")
+                    # 検索なしの場合は通常表示
+                    st.text_area(
+                        "入力されたテキスト:",
+                        value=text_content,
+                        height=400,
+                        disabled=True,
+                        key="text_content_display"
+                    )
+            else:
+                st.warning("⚠️ 文書内容が取得できませんでした。")
+
+    @staticmethod
+    def _get_pdf_base64(pdf_data: bytes) -> str:
+        """PDFのBase64文字列を取得（同一のbytesオブジェクトならセッション内のエンコード結果を再利用）"""
+        cached = st.session_state.get('_pdf_b64_cache')
+        if cached is not None and cached[0] is pdf_data:
+            return cached[1]
+        b64_pdf = base64.b64encode(pdf_data).decode()
+        st.session_state['_pdf_b64_cache'] = (pdf_data, b64_pdf)
+        return b64_pdf
 
 class UploadTab:
     """アップロード・設定タブを管理するクラス"""
@@ -409,7 +436,6 @@ class UploadTab:
             st.divider()
 
             # 設定確定と実行ボタン
-            from services.session_manager import SessionManager
             is_locked = SessionManager.is_settings_locked()
 
             if not is_locked:
@@ -436,55 +462,7 @@ class UploadTab:
                 st.info("🔒 設定が確定されました。実行開始できます。")
 
                 # 実行開始・リセットボタンのグラデーションスタイルを追加
-                st.markdown("""
-                <style>
-                /* 実行開始ボタン（primary）のスタイル */
-                div[data-testid="stButton"] > button[kind="primary"] {
-                    background: linear-gradient(135deg, #ff6b6b 0%, #ee5a52 50%, #ff4757 100%) !important;
-                    border: 1px solid #ff4757 !important;
-                    border-radius: 12px !important;
-                    color: white !important;
-                    font-weight: 600 !important;
-                    backdrop-filter: blur(10px) !important;
-                    -webkit-backdrop-filter: blur(10px) !important;
-                    box-shadow:
-                        0 4px 15px rgba(255, 75, 87, 0.3),
-                        inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
-                    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-                }
-
-                div[data-testid="stButton"] > button[kind="primary"]:hover {
-                    background: linear-gradient(135deg, #ff7675 0%, #fd79a8 50%, #e84393 100%) !important;
-                    transform: translateY(-2px) !important;
-                    box-shadow:
-                        0 6px 20px rgba(255, 75, 87, 0.4),
-                        inset 0 1px 0 rgba(255, 255, 255, 0.3) !important;
-                }
-
-                /* リセットボタン（secondary）のスタイル */
-                div[data-testid="stButton"] > button[kind="secondary"] {
-                    background: linear-gradient(135deg, rgba(173, 216, 230, 0.4) 0%, rgba(135, 206, 235, 0.5) 50%, rgba(176, 224, 230, 0.4) 100%) !important;
-                    border: 1px solid rgba(173, 216, 230, 0.6) !important;
-                    border-radius: 12px !important;
-                    color: #2c5aa0 !important;
-                    font-weight: 500 !important;
-                    backdrop-filter: blur(10px) !important;
-                    -webkit-backdrop-filter: blur(10px) !important;
-                    box-shadow:
-                        0 2px 8px rgba(173, 216, 230, 0.3),
-                        inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
-                    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-                }
-
-                div[data-testid="stButton"] > button[kind="secondary"]:hover {
-                    background: linear-gradient(135deg, rgba(173, 216, 230, 0.6) 0%, rgba(135, 206, 235, 0.7) 50%, rgba(176, 224, 230, 0.6) 100%) !important;
-                    transform: translateY(-2px) !important;
-                    box-shadow:
-                        0 4px 16px rgba(173, 216, 230, 0.4),
-                        inset 0 1px 0 rgba(255, 255, 255, 0.3) !important;
-                }
-                </style>
-                """, unsafe_allow_html=True)
+                StyleManager.apply_action_button_styles()
 
                 col1, col2 = st.columns([1, 1])
                 with col1:
@@ -509,7 +487,6 @@ class UploadTab:
                         st.rerun()
 
                 # 処理完了チェック（シンプル）
-                from services.session_manager import SessionManager
                 current_step = SessionManager.get_step()
 
                 if current_step == "completed" and SessionManager.get_final_report():
@@ -518,62 +495,8 @@ class UploadTab:
             # 入力がない場合の詳細説明
             st.info("📄 PDFファイルまたはテキストを入力して、AIエージェントによる文書理解セッションを開始してください")
 
-            # アプリの特徴
-            st.markdown("### ✨ このアプリの特徴")
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown("**🤖 3つのAIエージェント**")
-                st.markdown("- 🎓 **学生エージェント**: 文書について質問を生成")
-                st.markdown("- 👨‍🏫 **教師エージェント**: 詳細で分かりやすい回答を提供")
-                st.markdown("- 📋 **要約エージェント**: 文書要約と最終レポート作成")
-
-            with col2:
-                st.markdown("**📊  主要機能**")
-                st.markdown("- 💡 **理解促進**: Q&A形式で段階的に理解")
-                st.markdown("- 🔄 **フォローアップ**: 難しい回答には追加説明")
-                st.markdown("- 📝 **レポート**: 学習内容をMarkdown形式で整理")
-
-            st.divider()
-
-            # 使用方法
-            st.markdown("### 🚀 使用方法")
-
-            steps_col1, steps_col2, steps_col3 = st.columns(3)
-
-            with steps_col1:
-                st.markdown("""
-                **ステップ1: 設定確認**
-                左サイドバーで設定を確認・調整
-
-                **ステップ2: ファイル選択**
-                PDFファイルをドラッグ&ドロップ, またはテキスト入力
-
-                **ステップ3: 実行開始**
-                🚀ボタンでQ&Aセッション開始
-                """)
-
-            with steps_col2:
-                st.markdown("**📋 対応ファイル**")
-                st.markdown("- **形式**: PDFファイル（.pdf）, テキスト入力")
-                st.markdown("- **サイズ**: 最大50MB")
-                st.markdown("- **内容**: 論文、レポート、マニュアル等の文書")
-
-            with steps_col3:
-                st.markdown("**⚙️ 設定項目**")
-                st.markdown("- **Q&A数**: 1-20回（推奨: 10回）")
-                st.markdown("- **フォローアップ質問**: 有効/無効")
-                st.markdown("- **重要単語**: 優先的に質問生成する単語指定")
-
-            st.divider()
-
-            # 注意事項
-            st.markdown("### ⚠️ ご利用上の注意")
-            st.markdown("""
-            - 処理時間は文書の長さとQ&A数に比例します（目安: 10Q&Aで3-5分）
-            - 専門的な内容ほど、より詳細な説明が生成されます
-            - 生成されるQ&Aは学習効果を重視した構成になっています
-            """)
+            # 特徴・使用方法・注意事項は静的なので、1回のst.markdownでまとめて描画
+            st.markdown(_UPLOAD_HELP_HTML, unsafe_allow_html=True)
 
         return result
 
@@ -586,14 +509,7 @@ class ProcessingTab:
     def render_processing_status(self, current_step: str, progress_text: str = ""):
         """処理状況を表示（軽量版）"""
         # シンプルなステップ表示
-        step_descriptions = {
-            "pdf_processing": "📄 PDFファイルを処理中...",
-            "summary_generation": "📋 文書要約を生成中...",
-            "qa_session": "💬 Q&Aセッションを実行中...",
-            "final_report": "📊 最終レポートを作成中..."
-        }
-
-        current_step_text = step_descriptions.get(current_step, "処理中...")
+        current_step_text = _STEP_DESCRIPTIONS.get(current_step, "処理中...")
         st.info(current_step_text)
 
         if progress_text:
@@ -606,13 +522,11 @@ class ProcessingTab:
         
         with col1:
             if st.button("🔄 処理をリセット", help="処理状態をリセットして最初からやり直します"):
-                from services.session_manager import SessionManager
                 SessionManager.reset_session()
                 st.rerun()
         
         with col2:
             if st.button("⏹️ 処理を強制停止", help="現在の処理を強制停止します"):
-                from services.session_manager import SessionManager
                 SessionManager.stop_processing()
                 SessionManager.set_step("upload")
                 st.rerun()
@@ -1,9 +1,30 @@
 import os
 import time
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import re
-import math
+from collections import Counter
+
+# キーフレーズ候補（4文字以上の単語）
+_KEY_PHRASE_RE = re.compile(r'\b\w{4,}\b')
+
+# ファイルサイズの表示単位（1024倍ごと）
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# テキストクリーニング用のパターン
+_WHITESPACE_RE = re.compile(r'\s+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+
+@lru_cache(maxsize=8)
+def _clean_text(text: str) -> str:
+    """テキストをクリーニング（同じ文書を繰り返し処理しないよう結果を保持）"""
+    # 余分な空白を削除
+    text = _WHITESPACE_RE.sub(' ', text)
+    # 改行を正規化
+    text = _BLANK_LINES_RE.sub('\n\n', text)
+    # 先頭・末尾の空白を削除
+    return text.strip()
 
 class TextUtils:
     """テキスト処理のユーティリティ"""
@@ -11,13 +32,7 @@ class TextUtils:
     @staticmethod
     def clean_text(text: str) -> str:
         """テキストをクリーニング"""
-        # 余分な空白を削除
-        text = re.sub(r'\s+', ' ', text)
-        # 改行を正規化
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        # 先頭・末尾の空白を削除
-        text = text.strip()
-        return text
+        return _clean_text(text)
     
     @staticmethod
     def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
@@ -29,11 +44,8 @@ class TextUtils:
     @staticmethod
     def extract_key_phrases(text: str, max_phrases: int = 5) -> List[str]:
         """テキストからキーフレーズを抽出（簡易版）"""
-        # 簡易的な実装：長い単語を抽出
-        words = re.findall(r'\b\w{4,}\b', text)
-        # 頻度でソート
-        from collections import Counter
-        word_freq = Counter(words)
+        # 簡易的な実装：長い単語を大文字小文字を区別せずに数え、頻度順に返す
+        word_freq = Counter(m.group(0).lower() for m in _KEY_PHRASE_RE.finditer(text))
         return [word for word, _ in word_freq.most_common(max_phrases)]
     
     @staticmethod
@@ -76,11 +88,10 @@ class FileUtils:
         if size_bytes == 0:
             return "0B"
         
-        size_names = ["B", "KB", "MB", "GB", "TB"]
-        i = int(math.floor(math.log(size_bytes, 1024)))
-        p = math.pow(1024, i)
-        s = round(size_bytes / p, 2)
-        return f"{s} {size_names[i]}"
+        # 単位の段階はビット長から求める（1024 = 2**10）
+        i = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        s = round(size_bytes / (1 << (10 * i)), 2)
+        return f"{s} {_SIZE_UNITS[i]}"
 
 class ValidationUtils:
     """検証関連のユーティリティ"""
@@ -121,20 +132,34 @@ class ValidationUtils:
 def clamp(n: int, min_v: int, max_v: int) -> int:
     return max(min_v, min(n, max_v))
 
-def estimate_tokens(text: str, model: Optional[str] = None) -> int:
-    """トークン数を概算"""
+# トークン数の概算に使うエンコーディング（優先順）
+_TOKEN_ENCODING_NAMES = ("o200k_base", "cl100k_base", "p50k_base", "gpt2")
+
+@lru_cache(maxsize=1)
+def _get_token_encoding():
+    """利用可能な最初のエンコーディングを一度だけ解決（tiktokenが使えない場合はNone）"""
     try:
         import tiktoken
-        enc_names = ["o200k_base", "cl100k_base", "p50k_base", "gpt2"]
-        for name in enc_names:
-            try:
-                enc = tiktoken.get_encoding(name)
-                return len(enc.encode(text or ""))
-            except Exception:
-                continue
-        return max(1, len(text) // 4)
     except Exception:
-        return max(1, len(text) // 4)
+        return None
+    for name in _TOKEN_ENCODING_NAMES:
+        try:
+            return tiktoken.get_encoding(name)
+        except Exception:
+            continue
+    return None
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """トークン数を概算"""
+    if not text:
+        return 0
+    enc = _get_token_encoding()
+    if enc is not None:
+        try:
+            return len(enc.encode(text))
+        except Exception:
+            pass
+    return max(1, len(text) // 4)
 
 def bytes_to_mb(size_bytes: int) -> float:
     return size_bytes / 1_000_000.0
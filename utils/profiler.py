@@ -2,12 +2,69 @@ import time
 import psutil
 import logging
 import asyncio
+import heapq
 from functools import wraps
+from operator import itemgetter
 from typing import Dict, Any, List
 from datetime import datetime
 import json
 import os
-from contextlib import contextmanager
+import queue
+import atexit
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class _OperationProfile:
+    """profile_operationが返すコンテキストマネージャー（ジェネレーターを介さず計測する）"""
+
+    __slots__ = ('profiler', 'operation_name', 'metadata', 'operation_data')
+
+    def __init__(self, profiler: 'PerformanceProfiler', operation_name: str, metadata: Dict[str, Any]):
+        self.profiler = profiler
+        self.operation_name = operation_name
+        self.metadata = metadata
+        self.operation_data = None
+
+    def __enter__(self) -> Dict[str, Any]:
+        profiler = self.profiler
+        profiler._ensure_logging()
+        self.operation_data = {
+            'operation_name': self.operation_name,
+            'start_ns': time.perf_counter_ns(),
+            'start_memory': profiler._get_process_memory(),
+            'metadata': self.metadata
+        }
+
+        profiler.logger.info("Operation started: %s", self.operation_name)
+        return self.operation_data
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        profiler = self.profiler
+        operation_data = self.operation_data
+        start_memory = operation_data['start_memory']
+
+        # 経過時間は単調増加するperf_counter_nsの整数差で測り、秒への変換は一度だけ行う
+        end_ns = time.perf_counter_ns()
+        end_memory = profiler._get_process_memory()
+        duration = (end_ns - operation_data['start_ns']) / 1e9
+
+        operation_data.update({
+            'end_ns': end_ns,
+            'end_memory': end_memory,
+            'duration': duration,
+            'memory_delta': {
+                'rss_mb': end_memory['rss_mb'] - start_memory['rss_mb'],
+                'vms_mb': end_memory['vms_mb'] - start_memory['vms_mb']
+            }
+        })
+
+        if profiler.current_session:
+            profiler.current_session['operations'].append(operation_data)
+
+        profiler._log_operation_result(operation_data)
+        # 例外は握りつぶさずに呼び出し元へ伝播させる
+        return False
 
 
 class PerformanceProfiler:
@@ -16,7 +73,18 @@ class PerformanceProfiler:
     def __init__(self):
         self.profile_data = {}
         self.current_session = None
-        self.setup_logging()
+        # QA_PROFILER=0 の場合、デコレーターは計測なしで元の関数をそのまま返す（デコレート時に判定）
+        self.enabled = os.getenv("QA_PROFILER", "1") != "0"
+        # プロセスハンドルは一度だけ取得して使い回す（cpu_percentも前回呼び出しからの差分になる）
+        self._process = psutil.Process()
+        # ログファイルは実際にプロファイルを開始するまで作らない（import時の副作用を避ける）
+        self.logger = None
+        self.profile_log_file = None
+
+    def _ensure_logging(self):
+        """初回使用時にのみログ出力を設定"""
+        if self.logger is None:
+            self.setup_logging()
 
     def setup_logging(self):
         """ログファイルの設定"""
@@ -29,6 +97,8 @@ class PerformanceProfiler:
         # ロガーの設定
         self.logger = logging.getLogger('performance_profiler')
         self.logger.setLevel(logging.INFO)
+        # 専用ファイルにのみ出力し、ルートロガーのハンドラーへ二重に渡さない
+        self.logger.propagate = False
 
         # ファイルハンドラー
         file_handler = logging.FileHandler(profile_log_file, encoding='utf-8')
@@ -41,34 +111,43 @@ class PerformanceProfiler:
         )
         file_handler.setFormatter(formatter)
 
-        self.logger.addHandler(file_handler)
+        # ファイル書き込みはバックグラウンドスレッドに任せ、計測中のスレッドはキューへの追加のみ行う
+        log_queue = queue.SimpleQueue()
+        self._log_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        self._log_listener.start()
+        # 終了時に残りのログを書き出してからスレッドを止める
+        atexit.register(self._log_listener.stop)
+
+        self.logger.addHandler(QueueHandler(log_queue))
 
         self.profile_log_file = profile_log_file
         self.logger.info("=== Performance Profiling Session Started ===")
 
     def start_session(self, session_name: str):
         """プロファイリングセッションを開始"""
+        self._ensure_logging()
         self.current_session = {
             'session_name': session_name,
-            'start_time': time.time(),
+            'started_at': datetime.now().isoformat(),
+            'start_ns': time.perf_counter_ns(),
             'operations': [],
             'system_metrics': {
                 'start_memory': self._get_memory_usage(),
                 'start_cpu': self._get_cpu_usage()
             }
         }
-        self.logger.info(f"Session started: {session_name}")
+        self.logger.info("Session started: %s", session_name)
 
     def end_session(self):
         """プロファイリングセッションを終了"""
         if not self.current_session:
             return
 
-        end_time = time.time()
-        session_duration = end_time - self.current_session['start_time']
+        end_ns = time.perf_counter_ns()
+        session_duration = (end_ns - self.current_session['start_ns']) / 1e9
 
         self.current_session.update({
-            'end_time': end_time,
+            'end_ns': end_ns,
             'duration': session_duration,
             'system_metrics': {
                 **self.current_session['system_metrics'],
@@ -85,71 +164,49 @@ class PerformanceProfiler:
 
         self.current_session = None
 
-    def _get_memory_usage(self) -> Dict[str, float]:
-        """メモリ使用量を取得"""
-        process = psutil.Process()
-        memory_info = process.memory_info()
+    def _get_process_memory(self) -> Dict[str, float]:
+        """プロセスのメモリ使用量を取得（操作ごとの計測用）"""
+        memory_info = self._process.memory_info()
         return {
             'rss_mb': memory_info.rss / 1024 / 1024,  # MB
-            'vms_mb': memory_info.vms / 1024 / 1024,  # MB
+            'vms_mb': memory_info.vms / 1024 / 1024  # MB
+        }
+
+    def _get_memory_usage(self) -> Dict[str, float]:
+        """メモリ使用量を取得（システム全体の使用率を含む、セッション開始・終了時用）"""
+        return {
+            **self._get_process_memory(),
             'system_memory_percent': psutil.virtual_memory().percent
         }
 
     def _get_cpu_usage(self) -> Dict[str, float]:
         """CPU使用率を取得"""
         return {
-            'process_cpu_percent': psutil.Process().cpu_percent(),
+            'process_cpu_percent': self._process.cpu_percent(),
             'system_cpu_percent': psutil.cpu_percent()
         }
 
-    @contextmanager
-    def profile_operation(self, operation_name: str, **metadata):
+    def profile_operation(self, operation_name: str, **metadata) -> '_OperationProfile':
         """操作のプロファイリングコンテキストマネージャー"""
-        start_time = time.time()
-        start_memory = self._get_memory_usage()
-
-        operation_data = {
-            'operation_name': operation_name,
-            'start_time': start_time,
-            'start_memory': start_memory,
-            'metadata': metadata
-        }
-
-        self.logger.info(f"Operation started: {operation_name}")
-
-        try:
-            yield operation_data
-        finally:
-            end_time = time.time()
-            end_memory = self._get_memory_usage()
-            duration = end_time - start_time
-
-            operation_data.update({
-                'end_time': end_time,
-                'end_memory': end_memory,
-                'duration': duration,
-                'memory_delta': {
-                    'rss_mb': end_memory['rss_mb'] - start_memory['rss_mb'],
-                    'vms_mb': end_memory['vms_mb'] - start_memory['vms_mb']
-                }
-            })
-
-            if self.current_session:
-                self.current_session['operations'].append(operation_data)
-
-            self._log_operation_result(operation_data)
+        return _OperationProfile(self, operation_name, metadata)
 
     def profile_async_function(self, func_name: str = None):
         """非同期関数のデコレーター"""
         def decorator(func):
+            if not self.enabled:
+                return func
             operation_name = func_name or f"{func.__module__}.{func.__name__}"
+            # 関数名は呼び出しごとに変わらないため、デコレート時に一度だけ取得
+            function_name = func.__name__
 
             @wraps(func)
             async def wrapper(*args, **kwargs):
-                with self.profile_operation(operation_name,
-                                          function=func.__name__,
-                                          args_count=len(args),
-                                          kwargs_count=len(kwargs)):
+                # キーワード引数の詰め直しを避け、メタデータを直接渡してコンテキストマネージャーを生成
+                with _OperationProfile(self, operation_name, {
+                    'function': function_name,
+                    'args_count': len(args),
+                    'kwargs_count': len(kwargs)
+                }):
                     return await func(*args, **kwargs)
             return wrapper
         return decorator
@@ -157,36 +214,43 @@ class PerformanceProfiler:
     def profile_function(self, func_name: str = None):
         """同期関数のデコレーター"""
         def decorator(func):
+            if not self.enabled:
+                return func
             operation_name = func_name or f"{func.__module__}.{func.__name__}"
+            # 関数名は呼び出しごとに変わらないため、デコレート時に一度だけ取得
+            function_name = func.__name__
 
             @wraps(func)
             def wrapper(*args, **kwargs):
-                with self.profile_operation(operation_name,
-                                          function=func.__name__,
-                                          args_count=len(args),
-                                          kwargs_count=len(kwargs)):
+                # キーワード引数の詰め直しを避け、メタデータを直接渡してコンテキストマネージャーを生成
+                with _OperationProfile(self, operation_name, {
+                    'function': function_name,
+                    'args_count': len(args),
+                    'kwargs_count': len(kwargs)
+                }):
                     return func(*args, **kwargs)
             return wrapper
         return decorator
 
     def _log_operation_result(self, operation_data: Dict[str, Any]):
         """操作結果をログに出力"""
+        operation_name = operation_data['operation_name']
         duration = operation_data['duration']
         memory_delta = operation_data['memory_delta']
 
-        self.logger.info(
-            f"Operation completed: {operation_data['operation_name']} | "
-            f"Duration: {duration:.3f}s | "
-            f"Memory delta: RSS {memory_delta['rss_mb']:+.2f}MB, "
-            f"VMS {memory_delta['vms_mb']:+.2f}MB"
-        )
+        # 出力されないレベルでは文字列の組み立て自体を行わない（%形式で遅延フォーマット）
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "Operation completed: %s | Duration: %.3fs | Memory delta: RSS %+.2fMB, VMS %+.2fMB",
+                operation_name, duration, memory_delta['rss_mb'], memory_delta['vms_mb']
+            )
 
         # ボトルネック検出
         if duration > 10.0:  # 10秒以上の場合
-            self.logger.warning(f"BOTTLENECK DETECTED: {operation_data['operation_name']} took {duration:.3f}s")
+            self.logger.warning("BOTTLENECK DETECTED: %s took %.3fs", operation_name, duration)
 
         if memory_delta['rss_mb'] > 100:  # 100MB以上のメモリ増加
-            self.logger.warning(f"HIGH MEMORY USAGE: {operation_data['operation_name']} used +{memory_delta['rss_mb']:.2f}MB")
+            self.logger.warning("HIGH MEMORY USAGE: %s used +%.2fMB", operation_name, memory_delta['rss_mb'])
 
     def _log_session_summary(self):
         """セッション全体のサマリーをログに出力"""
@@ -197,39 +261,38 @@ class PerformanceProfiler:
         total_duration = session['duration']
         operations = session['operations']
 
-        # 最も時間がかかった操作トップ5
-        slowest_ops = sorted(operations, key=lambda x: x['duration'], reverse=True)[:5]
+        # 最も時間がかかった操作トップ5（全件ソートせず上位のみ抽出）
+        slowest_ops = heapq.nlargest(5, operations, key=itemgetter('duration'))
 
         # 最もメモリを使った操作トップ5
-        memory_intensive_ops = sorted(operations,
-                                    key=lambda x: x['memory_delta']['rss_mb'],
-                                    reverse=True)[:5]
+        memory_intensive_ops = heapq.nlargest(5, operations,
+                                              key=lambda x: x['memory_delta']['rss_mb'])
 
         self.logger.info("=== SESSION SUMMARY ===")
-        self.logger.info(f"Session: {session['session_name']}")
-        self.logger.info(f"Total duration: {total_duration:.3f}s")
-        self.logger.info(f"Total operations: {len(operations)}")
+        self.logger.info("Session: %s", session['session_name'])
+        self.logger.info("Total duration: %.3fs", total_duration)
+        self.logger.info("Total operations: %d", len(operations))
 
         memory_start = session['system_metrics']['start_memory']
         memory_end = session['system_metrics']['end_memory']
         total_memory_delta = memory_end['rss_mb'] - memory_start['rss_mb']
 
-        self.logger.info(f"Total memory delta: {total_memory_delta:+.2f}MB")
+        self.logger.info("Total memory delta: %+.2fMB", total_memory_delta)
 
         self.logger.info("=== TOP 5 SLOWEST OPERATIONS ===")
         for i, op in enumerate(slowest_ops, 1):
-            self.logger.info(f"{i}. {op['operation_name']}: {op['duration']:.3f}s")
+            self.logger.info("%d. %s: %.3fs", i, op['operation_name'], op['duration'])
 
         self.logger.info("=== TOP 5 MEMORY INTENSIVE OPERATIONS ===")
         for i, op in enumerate(memory_intensive_ops, 1):
             delta = op['memory_delta']['rss_mb']
-            self.logger.info(f"{i}. {op['operation_name']}: {delta:+.2f}MB")
+            self.logger.info("%d. %s: %+.2fMB", i, op['operation_name'], delta)
 
         self.logger.info("=== BOTTLENECK ANALYSIS ===")
         bottlenecks = [op for op in operations if op['duration'] > 5.0]
         if bottlenecks:
             for bottleneck in bottlenecks:
-                self.logger.info(f"BOTTLENECK: {bottleneck['operation_name']} ({bottleneck['duration']:.3f}s)")
+                self.logger.info("BOTTLENECK: %s (%.3fs)", bottleneck['operation_name'], bottleneck['duration'])
         else:
             self.logger.info("No significant bottlenecks detected")
 
@@ -240,23 +303,43 @@ class PerformanceProfiler:
         if not self.current_session:
             return
 
-        json_file = f'logs/performance_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+        # ファイル名と保存時刻は同じ時刻から作る（秒をまたいでずれないように）
+        saved_at = datetime.now()
+        json_file = f'logs/performance_data_{saved_at.strftime("%Y%m%d_%H%M%S")}.json'
 
         # datetime オブジェクトを文字列に変換
         session_data = {
             **self.current_session,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': saved_at.isoformat()
         }
 
+        # 全体を一度に文字列化してから1回の書き込みで保存（インデントなしの詰めた形式でサイズを抑える）
+        payload = json.dumps(session_data, ensure_ascii=False, separators=(',', ':'), default=str)
         with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2, ensure_ascii=False, default=str)
+            f.write(payload)
 
-        self.logger.info(f"Session data saved to: {json_file}")
+        self.logger.info("Session data saved to: %s", json_file)
 
     def get_log_file_path(self) -> str:
         """ログファイルのパスを取得"""
+        self._ensure_logging()
         return self.profile_log_file
 
 
-# グローバルプロファイラーインスタンス
-profiler = PerformanceProfiler()
\ No newline at end of file
+# グローバルプロファイラーインスタンス（初めて参照されたときに生成）
+_profiler = None
+# 複数のスクリプト実行スレッドから同時に参照されても1つだけ生成するためのロック
+_profiler_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    """モジュール属性 profiler を遅延生成して返す（PEP 562）"""
+    global _profiler
+    if name == 'profiler':
+        if _profiler is None:
+            with _profiler_lock:
+                # ロック待ちの間に他のスレッドが生成済みの場合はそれを使う
+                if _profiler is None:
+                    _profiler = PerformanceProfiler()
+        return _profiler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,15 @@
+import re
 from typing import Dict, Any, Optional
-from utils.helpers import FileUtils
+
+# アップロード可能なファイルサイズの上限と、警告を出すサイズ（バイト）
+_MAX_FILE_SIZE_BYTES = 50 << 20  # 50MB
+_WARN_FILE_SIZE_BYTES = 30 << 20  # 30MB
+
+# Q&Aターン数の許容範囲
+_MIN_QA_TURNS, _MAX_QA_TURNS = 5, 20
+
+# OpenAI APIキーの形式（接頭辞 sk- と全体で20文字以上を1回の照合で確認）
+_API_KEY_RE = re.compile(r'sk-[A-Za-z0-9_-]{17,}')
 
 class InputValidator:
     """入力検証を行うクラス"""
@@ -19,24 +29,24 @@ class InputValidator:
             return result
         
         # PDFファイルの検証
-        if hasattr(file_obj, 'type'):
-            if not file_obj.type == 'application/pdf':
-                result["is_valid"] = False
-                result["error_message"] = "PDFファイルのみ対応しています"
-                return result
+        file_type = getattr(file_obj, 'type', None)
+        if file_type is not None and file_type != 'application/pdf':
+            result["is_valid"] = False
+            result["error_message"] = "PDFファイルのみ対応しています"
+            return result
         
         # ファイルサイズの検証
-        if hasattr(file_obj, 'size'):
-            max_size = 50 * 1024 * 1024  # 50MB
-            
-            if file_obj.size > max_size:
+        file_size = getattr(file_obj, 'size', None)
+        if file_size is not None:
+            if file_size > _MAX_FILE_SIZE_BYTES:
+                # サイズ表記はエラー時のみ必要なため、ここで読み込む
+                from utils.helpers import FileUtils
                 result["is_valid"] = False
-                result["error_message"] = f"ファイルサイズが上限（50MB）を超えています: {FileUtils.format_file_size(file_obj.size)}"
+                result["error_message"] = f"ファイルサイズが上限（50MB）を超えています: {FileUtils.format_file_size(file_size)}"
                 return result
             
             # 警告レベル（30MB以上）
-            warning_size = 30 * 1024 * 1024
-            if file_obj.size > warning_size:
+            if file_size > _WARN_FILE_SIZE_BYTES:
                 result["warnings"].append("ファイルサイズが大きいため、処理に時間がかかる可能性があります")
         
         return result
@@ -57,10 +67,9 @@ class InputValidator:
             return result
         
         # 範囲チェック
-        min_turns, max_turns = 5, 20
-        if qa_turns < min_turns or qa_turns > max_turns:
+        if qa_turns < _MIN_QA_TURNS or qa_turns > _MAX_QA_TURNS:
             result["is_valid"] = False
-            result["error_message"] = f"Q&Aターン数は{min_turns}-{max_turns}の範囲で設定してください"
+            result["error_message"] = f"Q&Aターン数は{_MIN_QA_TURNS}-{_MAX_QA_TURNS}の範囲で設定してください"
             return result
         
         # 警告レベル
@@ -82,16 +91,13 @@ class InputValidator:
             result["error_message"] = "OpenAI APIキーが設定されていません"
             return result
         
-        # 基本的な形式チェック
-        if not api_key.startswith('sk-'):
-            result["is_valid"] = False
-            result["error_message"] = "無効なAPIキー形式です"
-            return result
-        
-        # 長さチェック（概算）
-        if len(api_key) < 20:
+        # 形式チェック（不一致の場合のみ理由を切り分ける）
+        if not _API_KEY_RE.fullmatch(api_key):
             result["is_valid"] = False
-            result["error_message"] = "APIキーが短すぎます"
+            if api_key.startswith('sk-') and len(api_key) < 20:
+                result["error_message"] = "APIキーが短すぎます"
+            else:
+                result["error_message"] = "無効なAPIキー形式です"
             return result
         
         return result
\ No newline at end of file